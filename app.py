@@ -1,15 +1,87 @@
 import os
-import json
 from pathlib import Path
 
 from dotenv import load_dotenv
+from sqlalchemy.exc import IntegrityError
+from werkzeug.exceptions import RequestEntityTooLarge
 from werkzeug.utils import secure_filename
-from flask import Flask, render_template, request, redirect, url_for, flash, session
+from flask import (
+    Flask,
+    Response,
+    render_template,
+    request,
+    redirect,
+    url_for,
+    flash,
+    session,
+    jsonify,
+    stream_with_context,
+)
 
-from backend.extractors import load_resume_text, fetch_job_description_from_url
-from backend.graph import build_job_graph
+from backend.extractors import load_resume_text, fetch_job_description_from_url, clip_text, JD_MAX_CHARS
+from backend.memprof import profile_memory
+from backend.graph import (
+    build_job_graph,
+    get_partial_graph,
+    nodes_to_rerun,
+    PIPELINE,
+    FIT_NODES,
+    STRUCTURED_PARSE_FIT,
+)
 from backend.db import init_db, db
-from backend.models import Application, User
+from backend.models import Application, User, UsageCounter
+from backend.applications import (
+    candidate_profile,
+    state_from_application,
+    result_from_application,
+    pending_nodes,
+    run_with_checkpoints,
+    mark_stale,
+    request_key,
+    find_inflight,
+)
+from backend.aio import ASYNC_GRAPH
+from backend.background import submit_async, submit_remaining, get_scheduler
+from backend.retention import retention_cli
+from backend.assets import init_assets
+from backend.httpcache import (
+    PRIVATE_REVALIDATE,
+    page_cache,
+    cached_page,
+    cacheable_request,
+    is_not_modified,
+    conditional_response,
+    application_version,
+    application_etag,
+)
+from backend.quotas import (
+    TIERS,
+    QuotaExceeded,
+    claim_run,
+    refund_run,
+    check_tokens,
+    limits_for,
+    usage_report,
+    update_quota,
+)
+from backend.search import search_applications
+from backend.admin import (
+    BULK_STATUS,
+    dashboard_stats,
+    search_users,
+    bulk_criteria,
+    bulk_set_status,
+    bulk_delete_users,
+)
+from backend.export import EXPORT_FORMATS, parse_export_args, export_stream, export_filename
+from backend.dedup import (
+    JD_DEDUP_ENABLED,
+    fingerprint,
+    find_duplicate,
+    record_hit,
+    register as register_jd,
+    duplicate_clusters,
+)
 from backend.auth import (
     login_required,
     admin_required,
@@ -34,7 +106,13 @@ if db_url.startswith("postgres://"):
 app.config["SQLALCHEMY_DATABASE_URI"] = db_url
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
 
+# Reject oversized uploads before they are read into memory
+MAX_UPLOAD_MB = int(os.getenv("MAX_UPLOAD_MB", "5"))
+app.config["MAX_CONTENT_LENGTH"] = MAX_UPLOAD_MB * 1024 * 1024
+
 init_db(app)
+app.cli.add_command(retention_cli)
+init_assets(app)
 
 # Seed admin user from env vars (ADMIN_EMAIL / ADMIN_PASSWORD)
 if not os.getenv("FLASK_SKIP_SEED"):
@@ -46,9 +124,18 @@ UPLOAD_DIR = Path("uploads")
 UPLOAD_DIR.mkdir(exist_ok=True)
 ALLOWED_EXT = {".pdf", ".docx", ".txt", ".md"}
 
+
+@app.errorhandler(RequestEntityTooLarge)
+def request_too_large(e):
+    flash(f"Upload too large. Please keep files and pasted text under {MAX_UPLOAD_MB} MB.", "danger")
+    return redirect(url_for("index"))
+
 # ---- Build graph once ----
 compiled_graph = build_job_graph()
 
+# Render the fit score first and finish resume/cover letter/Q&A in the background
+PROGRESSIVE_RESULTS = os.getenv("PROGRESSIVE_RESULTS", "0") == "1"
+
 
 # ----------------------------
 # Small helper: keep session in sync
@@ -102,6 +189,10 @@ def login():
 
     result = authenticate(email, password)
 
+    if result == "BUSY":
+        flash("The server is busy. Please try again in a moment.", "warning")
+        return redirect(url_for("login"))
+
     if result == "NOT_APPROVED":
         flash("Your account is not approved yet. Please wait for admin approval.", "warning")
         return redirect(url_for("login"))
@@ -140,18 +231,116 @@ def logout():
 def admin_users():
     sync_session_user()
 
-    users = User.query.order_by(User.created_at.desc()).all()
+    listing = search_users(
+        q=request.args.get("q", ""),
+        sort=request.args.get("sort", "created_at"),
+        direction=request.args.get("dir", "desc"),
+        page=request.args.get("page", 1, type=int),
+    )
 
-    # Dashboard stats
-    stats = {
-        "total_users": User.query.count(),
-        "pending_users": User.query.filter_by(status="pending").count(),
-        "total_apps": Application.query.count(),
-    }
+    # Dashboard stats (one aggregate query)
+    stats = dashboard_stats()
+
+    return render_template("admin_users.html", listing=listing, users=listing["users"], stats=stats, tiers=TIERS)
+
+
+
+@app.route("/admin/jd-clusters")
+@login_required
+@admin_required
+def admin_jd_clusters():
+    sync_session_user()
 
-    return render_template("admin_users.html", users=users, stats=stats)
+    clusters = duplicate_clusters()
+    return render_template("admin_jd_clusters.html", clusters=clusters)
 
 
+@app.route("/admin/export")
+@login_required
+@admin_required
+def admin_export():
+    sync_session_user()
+
+    try:
+        opts = parse_export_args(request.args)
+    except ValueError as e:
+        flash(str(e), "danger")
+        return redirect(url_for("admin_users"))
+
+    user_id = request.args.get("user_id", type=int)
+    return Response(
+        stream_with_context(export_stream(opts, user_id=user_id)),
+        mimetype=EXPORT_FORMATS[opts["format"]],
+        headers={"Content-Disposition": f"attachment; filename={export_filename(opts, 'all-applications')}"},
+    )
+
+
+@app.route("/admin/users/bulk", methods=["POST"])
+@login_required
+@admin_required
+def bulk_users():
+    sync_session_user()
+
+    action = request.form.get("action", "").strip()
+    if action not in BULK_STATUS and action != "delete":
+        flash("Unknown bulk action.", "danger")
+        return redirect(url_for("admin_users"))
+
+    ids = request.form.getlist("user_ids", type=int)
+    status = request.form.get("filter_status", "").strip() or None
+    older_than_days = request.form.get("older_than_days", type=int)
+
+    try:
+        criteria = bulk_criteria(ids=ids, status=status, older_than_days=older_than_days)
+        if action == "delete":
+            deleted = bulk_delete_users(criteria)
+            message = f"Deleted {deleted['users']} users and {deleted['applications']} applications."
+        else:
+            updated = bulk_set_status(action, criteria)
+            message = f"{BULK_STATUS[action].capitalize()} {updated} users."
+        db.session.commit()
+    except ValueError as e:
+        db.session.rollback()
+        flash(str(e), "warning")
+        return redirect(url_for("admin_users"))
+
+    flash(message, "success")
+    return redirect(url_for("admin_users"))
+
+
+@app.route("/admin/usage")
+@login_required
+@admin_required
+def admin_usage():
+    sync_session_user()
+
+    rows = [
+        {"user": user, "runs": runs, "tokens": tokens, "limits": limits_for(user)}
+        for user, runs, tokens in usage_report()
+    ]
+    # background queue of this worker process only
+    queued = get_scheduler().queued()
+
+    return render_template("admin_usage.html", rows=rows, tiers=TIERS, queued=queued)
+
+
+@app.route("/admin/users/<int:user_id>/quota", methods=["POST"])
+@login_required
+@admin_required
+def update_user_quota(user_id: int):
+    sync_session_user()
+
+    u = User.query.get_or_404(user_id)
+    try:
+        limits = update_quota(u, request.form)
+    except ValueError as e:
+        flash(str(e), "danger")
+        return redirect(url_for("admin_usage"))
+
+    db.session.commit()
+    flash(f"Updated quota for {u.email}: {limits['runs']} runs / {limits['tokens']} tokens per day.", "success")
+    return redirect(request.referrer or url_for("admin_usage"))
+
 
 @app.route("/admin/users/<int:user_id>/approve", methods=["POST"])
 @login_required
@@ -196,6 +385,7 @@ def delete_user(user_id: int):
 
     # delete applications first (safer if FK constraints exist)
     Application.query.filter_by(user_id=u.id).delete()
+    UsageCounter.query.filter_by(user_id=u.id).delete()
     db.session.delete(u)
     db.session.commit()
 
@@ -228,8 +418,9 @@ def index():
 @app.route("/run", methods=["POST"])
 @login_required
 @approved_required   # ✅ NEW: blocks pending/blocked users
+@profile_memory("run")
 def run_agent():
-    sync_session_user()
+    u = sync_session_user()
 
     # ----- User info -----
     name = request.form.get("name", "Candidate").strip()
@@ -245,7 +436,8 @@ def run_agent():
     job_company = request.form.get("job_company", "").strip()
     job_location = request.form.get("job_location", "").strip()
     job_url = request.form.get("job_url", "").strip()
-    jd_text = request.form.get("job_description", "").strip()
+    # clip before anything reads it; a fetched JD is clipped below
+    jd_text, jd_cut = clip_text(request.form.get("job_description", "").strip(), JD_MAX_CHARS)
 
     
 
@@ -277,7 +469,9 @@ def run_agent():
     file.save(save_path)
 
     try:
-        resume_text = load_resume_text(str(save_path))
+        resume_text, resume_cut = load_resume_text(str(save_path))
+        if resume_cut:
+            flash("Your resume is long, so only its first part was used.", "info")
         if len(resume_text.strip()) < 50:
             flash("Resume text extraction looks empty. Try DOCX or a text-based PDF.", "warning")
     except Exception as e:
@@ -287,7 +481,7 @@ def run_agent():
     # ----- JD extraction -----
     if job_url and not jd_text:
         try:
-            jd_text = fetch_job_description_from_url(job_url)
+            jd_text, jd_cut = clip_text(fetch_job_description_from_url(job_url), JD_MAX_CHARS)
         except Exception as e:
             flash(f"Failed to fetch JD from URL. Paste JD text instead. Error: {e}", "warning")
 
@@ -295,7 +489,24 @@ def run_agent():
         flash("Please provide a Job Description URL or paste JD text.", "danger")
         return redirect(url_for("index"))
 
-    # ----- Run graph -----
+    if jd_cut:
+        flash(f"The job description was trimmed to its first {JD_MAX_CHARS:,} characters.", "info")
+
+    # ----- Single-flight: attach duplicates to the run already in progress -----
+    run_key = request_key(session["user_id"], resume_text, jd_text, questions)
+    existing = find_inflight(run_key)
+    if existing:
+        flash("This application is already being generated — showing that run.", "info")
+        return redirect(url_for("application_detail", app_id=existing.id))
+
+    # ----- Daily quota (counted only for runs that actually start) -----
+    try:
+        claimed_day = claim_run(u)
+    except QuotaExceeded as e:
+        flash(str(e), "warning")
+        return redirect(url_for("index"))
+
+    # ----- Graph state -----
     state = {
         "user": {
             "name": name,
@@ -315,10 +526,27 @@ def run_agent():
         "questions": questions,
     }
 
-    result = compiled_graph.invoke(state)
-
-    # ----- Save to DB -----
-    fit = result.get("fit", {})
+    # ----- Reuse job parsing from a near-identical JD -----
+    nodes = list(PIPELINE)
+    jd_fp, dup = None, None
+    if JD_DEDUP_ENABLED:
+        jd_fp = fingerprint(jd_text)
+        dup = find_duplicate(jd_fp)
+        if dup:
+            if state["job"]["title"] == "Unknown Role" and dup.job_title:
+                state["job"]["title"] = dup.job_title
+            if state["job"]["company"] == "Unknown Company" and dup.job_company:
+                state["job"]["company"] = dup.job_company
+            state["job"]["location"] = state["job"]["location"] or dup.job_location
+            state["job_parsed_markdown"] = dup.job_parsed_markdown
+            nodes.remove("parse_job")
+            record_hit(dup, jd_fp)
+
+    # Only the resume-free parse_job output may be shared with other users;
+    # structured mode parses in the same call that reads the resume
+    share_fp = jd_fp if jd_fp and not dup and not STRUCTURED_PARSE_FIT else None
+
+    # ----- Save to DB (row is checkpointed after every node) -----
     user_id = session["user_id"]
 
     app_row = Application(
@@ -331,20 +559,66 @@ def run_agent():
         resume_text=state["user"]["resume_text"],
         job_description=state["job"]["description"],
         questions="\n".join(state.get("questions", [])) if state.get("questions") else None,
-        fit_score=fit.get("score"),
-        fit_level=fit.get("level"),
-        fit_reasons=json.dumps(fit.get("reasons", [])),
-        fit_gaps=json.dumps(fit.get("gaps", [])),
-        job_parsed_markdown=result.get("job_parsed_markdown"),
-        tailored_resume_md=result.get("tailored_resume_md"),
-        cover_letter=result.get("cover_letter"),
-        qna=result.get("qna"),
+        candidate_profile=candidate_profile(state["user"]),
+        job_parsed_markdown=state.get("job_parsed_markdown"),
+        status="running",
+        pending_nodes=",".join(nodes),
+        request_key=run_key,
+        inflight_key=run_key,
     )
 
     db.session.add(app_row)
-    db.session.commit()
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # another worker claimed the same submission between the check and the insert
+        db.session.rollback()
+        refund_run(user_id, claimed_day)
+        existing = find_inflight(run_key)
+        if existing:
+            flash("This application is already being generated — showing that run.", "info")
+            return redirect(url_for("application_detail", app_id=existing.id))
+        raise
 
-    return render_template("result.html", result=result, job=state["job"], user=state["user"])
+    # ----- Run graph -----
+    # Async: the whole run is a task on the shared event loop and the
+    # request returns at once; the page polls for sections as they land
+    if ASYNC_GRAPH:
+        submit_async(app, app_row.id, state, nodes, share_fp)
+        return redirect(url_for("application_detail", app_id=app_row.id))
+
+    # Progressive: only the fit decision runs in the request, the
+    # long-form outputs are finished in the background
+    if PROGRESSIVE_RESULTS:
+        head = [n for n in nodes if n in FIT_NODES]
+        tail = [n for n in nodes if n not in FIT_NODES]
+    else:
+        head, tail = nodes, []
+
+    graph = compiled_graph if head == PIPELINE else get_partial_graph(tuple(head))
+    try:
+        # with a tail to come the row stays running (and in flight) in between
+        result = run_with_checkpoints(graph, state, app_row, head, finalize=not tail)
+    except Exception as e:
+        flash(f"Run stopped before finishing ({e}). Completed steps were saved — you can resume it.", "danger")
+        return redirect(url_for("application_detail", app_id=app_row.id))
+    finally:
+        if share_fp:
+            register_jd(share_fp, state["job"], app_row.job_parsed_markdown)
+
+    if tail:
+        submit_remaining(app, app_row.id, app_row.user_id, tail)
+
+    return render_template(
+        "result.html",
+        result=result,
+        job=state["job"],
+        user=state["user"],
+        app_id=app_row.id,
+        questions=app_row.questions or "",
+        status=app_row.status,
+        pending=tail,
+    )
 
 
 @app.route("/applications")
@@ -352,20 +626,73 @@ def run_agent():
 def applications():
     sync_session_user()
 
+    q = request.args.get("q", "").strip()
+    if q:
+        page = request.args.get("page", 1, type=int)
+        search = search_applications(session["user_id"], q, page=page)
+        return render_template("applications.html", apps=search["apps"], search=search)
+
     apps = (
         Application.query.filter_by(user_id=session["user_id"])
         .order_by(Application.created_at.desc())
         .limit(50)
         .all()
     )
-    return render_template("applications.html", apps=apps)
+    return render_template("applications.html", apps=apps, search=None)
+
+
+@app.route("/applications/export")
+@login_required
+def export_applications():
+    sync_session_user()
+
+    try:
+        opts = parse_export_args(request.args)
+    except ValueError as e:
+        flash(str(e), "danger")
+        return redirect(url_for("applications"))
+
+    return Response(
+        stream_with_context(export_stream(opts, user_id=session["user_id"])),
+        mimetype=EXPORT_FORMATS[opts["format"]],
+        headers={"Content-Disposition": f"attachment; filename={export_filename(opts)}"},
+    )
 
 
 @app.route("/applications/<int:app_id>")
 @login_required
 def application_detail(app_id: int):
-    sync_session_user()
+    # refresh the session first: the ETag and page cache key on what it holds
+    if not sync_session_user():
+        flash("Please log in to continue.", "warning")
+        return redirect(url_for("login", next=request.path))
+
+    # Owner revisiting a finished page: answer from the validators alone
+    # (304) or from the rendered-page cache, without loading the row.
+    version = application_version(app_id)
+    fast_path = (
+        version is not None
+        and version.user_id == session["user_id"]
+        and version.status != "running"
+        and cacheable_request()
+    )
+    if fast_path:
+        etag = application_etag(app_id, version)
+        if is_not_modified(etag):
+            return conditional_response(None, etag, PRIVATE_REVALIDATE)
+
+        cache_key = ("application", app_id, etag)
+        html = page_cache.get(cache_key)
+        if html is None:
+            html = render_application(app_id)
+            if version.status == "completed":
+                page_cache.set(cache_key, html)
+        return conditional_response(html, etag, PRIVATE_REVALIDATE)
+
+    return render_application(app_id)
+
 
+def render_application(app_id: int):
     row = Application.query.get_or_404(app_id)
 
     # Only owner or admin can view
@@ -373,18 +700,8 @@ def application_detail(app_id: int):
         flash("You do not have access to this application.", "danger")
         return redirect(url_for("applications"))
 
-    result = {
-        "fit": {
-            "score": row.fit_score,
-            "level": row.fit_level,
-            "reasons": json.loads(row.fit_reasons or "[]"),
-            "gaps": json.loads(row.fit_gaps or "[]"),
-        },
-        "job_parsed_markdown": row.job_parsed_markdown,
-        "tailored_resume_md": row.tailored_resume_md,
-        "cover_letter": row.cover_letter,
-        "qna": row.qna,
-    }
+    mark_stale(row)
+    result = result_from_application(row)
     job = {
         "title": row.job_title,
         "company": row.job_company,
@@ -392,14 +709,157 @@ def application_detail(app_id: int):
         "source_url": row.job_url,
     }
 
-    return render_template("result.html", result=result, job=job, user={})
+    return render_template(
+        "result.html",
+        result=result,
+        job=job,
+        user={},
+        app_id=row.id,
+        questions=row.questions or "",
+        status=row.status,
+        pending=pending_nodes(row),
+        error=row.error,
+    )
+
+
+@app.route("/applications/<int:app_id>/status")
+@login_required
+def application_status(app_id: int):
+    row = Application.query.get_or_404(app_id)
+
+    # Only owner or admin can view
+    if (row.user_id != session["user_id"]) and (not session.get("is_admin")):
+        return jsonify({"error": "forbidden"}), 403
+
+    mark_stale(row)
+    return jsonify({
+        "status": row.status,
+        "pending": pending_nodes(row),
+        "sections": {
+            "tailored_resume_md": row.tailored_resume_md,
+            "cover_letter": row.cover_letter,
+            "qna": row.qna,
+        },
+    })
+
+
+@app.route("/applications/<int:app_id>/skip", methods=["POST"])
+@login_required
+def skip_remaining(app_id: int):
+    sync_session_user()
+
+    row = Application.query.get_or_404(app_id)
+
+    # Only owner or admin can skip
+    if (row.user_id != session["user_id"]) and (not session.get("is_admin")):
+        flash("You do not have access to this application.", "danger")
+        return redirect(url_for("applications"))
+
+    # The background run stops after the step it is currently on
+    if row.status == "running":
+        row.status = "cancelled"
+        row.inflight_key = None
+        db.session.commit()
+        flash("Skipped the remaining sections. You can resume them later.", "info")
+
+    return redirect(url_for("application_detail", app_id=row.id))
+
+
+@app.route("/applications/<int:app_id>/regenerate", methods=["POST"])
+@login_required
+@approved_required
+def regenerate_section(app_id: int):
+    u = sync_session_user()
+
+    row = Application.query.get_or_404(app_id)
+
+    # Only owner or admin can regenerate
+    if (row.user_id != session["user_id"]) and (not session.get("is_admin")):
+        flash("You do not have access to this application.", "danger")
+        return redirect(url_for("applications"))
+
+    if row.status == "running":
+        flash("This application is still being generated. Try again when it finishes.", "warning")
+        return redirect(url_for("application_detail", app_id=row.id))
+
+    try:
+        check_tokens(u)
+    except QuotaExceeded as e:
+        flash(str(e), "warning")
+        return redirect(url_for("application_detail", app_id=row.id))
+
+    section = request.form.get("section", "").strip()
+    if section not in PIPELINE:
+        flash("Unknown section to regenerate.", "danger")
+        return redirect(url_for("application_detail", app_id=row.id))
+
+    state = state_from_application(row)
+
+    # Questions can be edited before regenerating the Q&A
+    if section == "qna" and "questions" in request.form:
+        questions_raw = request.form.get("questions", "").strip()
+        questions = [q.strip() for q in questions_raw.splitlines() if q.strip()]
+        state["questions"] = questions
+        state.pop("qna", None)
+        row.questions = "\n".join(questions) if questions else None
+
+    # Re-run only the requested node and the nodes that depend on it
+    nodes = nodes_to_rerun(section)
+    try:
+        run_with_checkpoints(get_partial_graph(tuple(nodes)), state, row, nodes)
+    except Exception as e:
+        flash(f"Failed to regenerate: {e}", "danger")
+        return redirect(url_for("application_detail", app_id=row.id))
+
+    flash(f"Regenerated: {', '.join(nodes)}", "success")
+    if row.status != "completed":
+        flash(f"Still pending: {', '.join(pending_nodes(row))}. Resume the run to finish it.", "info")
+    return redirect(url_for("application_detail", app_id=row.id))
+
+
+@app.route("/applications/<int:app_id>/resume", methods=["POST"])
+@login_required
+@approved_required
+def resume_run(app_id: int):
+    u = sync_session_user()
+
+    row = Application.query.get_or_404(app_id)
+
+    # Only owner or admin can resume
+    if (row.user_id != session["user_id"]) and (not session.get("is_admin")):
+        flash("You do not have access to this application.", "danger")
+        return redirect(url_for("applications"))
+
+    nodes = pending_nodes(row)
+    if row.status not in ("failed", "cancelled") or not nodes:
+        flash("Nothing to resume for this application.", "info")
+        return redirect(url_for("application_detail", app_id=row.id))
+
+    try:
+        check_tokens(u)
+    except QuotaExceeded as e:
+        flash(str(e), "warning")
+        return redirect(url_for("application_detail", app_id=row.id))
+
+    # Continue from the checkpoint: only the nodes that never completed
+    state = state_from_application(row)
+    try:
+        run_with_checkpoints(get_partial_graph(tuple(nodes)), state, row, nodes)
+    except Exception as e:
+        flash(f"Resume failed again ({e}). Completed steps were saved.", "danger")
+        return redirect(url_for("application_detail", app_id=row.id))
+
+    flash("Run completed.", "success")
+    return redirect(url_for("application_detail", app_id=row.id))
 
 @app.route("/home")
+@cached_page
 def home():
     # Public landing page (no login required)
     return render_template("home.html")
 
 @app.route("/about")
+@cached_page
 def about():
     return render_template("about.html")
 
@@ -0,0 +1,163 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict
+
+from backend.db import db
+from backend.models import Application, UsageCounter, User
+
+USERS_PER_PAGE = 50
+
+# sort key -> column; anything else falls back to newest first
+USER_SORTS = {
+    "created_at": User.created_at,
+    "email": User.email,
+    "status": User.status,
+}
+
+
+def dashboard_stats() -> Dict[str, int]:
+    """
+    All admin counters in a single round-trip.
+    """
+    total_apps = db.select(db.func.count(Application.id)).scalar_subquery()
+    row = db.session.execute(
+        db.select(
+            db.func.count(User.id),
+            db.func.coalesce(db.func.sum(db.case((User.status == "pending", 1), else_=0)), 0),
+            total_apps,
+        )
+    ).one()
+
+    return {
+        "total_users": row[0],
+        "pending_users": row[1],
+        "total_apps": row[2],
+    }
+
+
+def _email_prefix_filter(prefix: str):
+    """
+    Prefix match on users.email that can use an index: a LIKE on Postgres
+    (backed by the varchar_pattern_ops index) and a range scan elsewhere,
+    since SQLite only optimizes LIKE on NOCASE columns.
+    """
+    if db.engine.dialect.name == "postgresql":
+        return User.email.startswith(prefix, autoescape=True)
+
+    upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    return db.and_(User.email >= prefix, User.email < upper)
+
+
+def search_users(q: str = "", sort: str = "created_at", direction: str = "desc", page: int = 1,
+                 per_page: int = USERS_PER_PAGE) -> Dict[str, Any]:
+    """
+    Paginated, sortable user list with optional email prefix search.
+    Application counts for the page are loaded in one grouped query.
+    """
+    q = q.strip().lower()
+    query = User.query
+    if q:
+        query = query.filter(_email_prefix_filter(q))
+
+    column = USER_SORTS.get(sort, User.created_at)
+    order = column.asc() if direction == "asc" else column.desc()
+    pagination = query.order_by(order, User.id.desc()).paginate(page=page, per_page=per_page, error_out=False)
+
+    ids = [u.id for u in pagination.items]
+    app_counts = {}
+    if ids:
+        app_counts = dict(
+            db.session.query(Application.user_id, db.func.count(Application.id))
+            .filter(Application.user_id.in_(ids))
+            .group_by(Application.user_id)
+            .all()
+        )
+
+    return {
+        "users": pagination.items,
+        "app_counts": app_counts,
+        "pagination": pagination,
+        "q": q,
+        "sort": sort if sort in USER_SORTS else "created_at",
+        "direction": "asc" if direction == "asc" else "desc",
+    }
+
+
+# ----------------------------
+# Bulk user operations
+# ----------------------------
+BULK_STATUS = {
+    "approve": "approved",
+    "block": "blocked",
+}
+
+# dependent applications are deleted in chunks to keep each statement short
+DELETE_BATCH_SIZE = 500
+
+
+def bulk_criteria(ids=None, status: str = None, older_than_days: int = None):
+    """
+    WHERE clause selecting the users a bulk action applies to: explicit ids
+    and/or a status + age filter. Admin accounts are never matched.
+    Raises ValueError when nothing narrows the selection.
+    """
+    conditions = [User.is_admin.is_(False)]
+
+    if ids:
+        conditions.append(User.id.in_(ids))
+    if status:
+        conditions.append(User.status == status)
+    if older_than_days is not None:
+        cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+        conditions.append(User.created_at < cutoff)
+
+    if len(conditions) == 1:
+        raise ValueError("Select users or a filter for the bulk action.")
+
+    return db.and_(*conditions)
+
+
+def bulk_set_status(action: str, criteria) -> int:
+    """
+    One UPDATE for every matching user. Caller commits.
+    """
+    result = db.session.execute(
+        db.update(User)
+        .where(criteria)
+        .values(status=BULK_STATUS[action])
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+def bulk_delete_users(criteria, batch_size: int = DELETE_BATCH_SIZE) -> Dict[str, int]:
+    """
+    Deletes matching users and their applications with set-based DELETEs.
+    Everything runs in the caller's transaction; caller commits.
+    """
+    target_ids = db.select(User.id).where(criteria)
+
+    apps_deleted = 0
+    while True:
+        batch = (
+            db.select(Application.id)
+            .where(Application.user_id.in_(target_ids))
+            .limit(batch_size)
+        )
+        result = db.session.execute(
+            db.delete(Application)
+            .where(Application.id.in_(batch))
+            .execution_options(synchronize_session=False)
+        )
+        apps_deleted += result.rowcount
+        if result.rowcount < batch_size:
+            break
+
+    db.session.execute(
+        db.delete(UsageCounter)
+        .where(UsageCounter.user_id.in_(target_ids))
+        .execution_options(synchronize_session=False)
+    )
+    result = db.session.execute(
+        db.delete(User).where(criteria).execution_options(synchronize_session=False)
+    )
+    return {"users": result.rowcount, "applications": apps_deleted}
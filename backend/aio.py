@@ -0,0 +1,54 @@
+import asyncio
+import os
+import threading
+from typing import AsyncGenerator, Awaitable, Iterator, TypeVar
+
+from backend.process import PerProcess
+
+T = TypeVar("T")
+
+# Run graphs with ainvoke/astream on one shared event loop per worker process
+ASYNC_GRAPH = os.getenv("ASYNC_GRAPH", "0") == "1"
+
+def _start_loop() -> asyncio.AbstractEventLoop:
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name="graph-event-loop", daemon=True).start()
+    return loop
+
+
+_loop = PerProcess(_start_loop)
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """
+    Returns this process's background event loop, starting it on first use.
+    Every request thread submits its LLM calls here, so all in-flight
+    pipelines of a worker share one loop (and one async HTTP client pool).
+    Re-created after fork so gunicorn workers never share a loop.
+    """
+    return _loop.get()
+
+
+def run_async(coro: Awaitable[T]) -> T:
+    """
+    Runs a coroutine on the shared loop and blocks the calling thread for the result.
+    """
+    return asyncio.run_coroutine_threadsafe(coro, get_loop()).result()
+
+
+def iter_async(agen: AsyncGenerator[T, None]) -> Iterator[T]:
+    """
+    Consumes an async generator on the shared loop, one item at a time,
+    so the caller (e.g. the request thread holding the DB session) can
+    handle each item as it arrives. If the caller stops early the generator
+    is closed on the loop too, so its cleanup still runs.
+    """
+    try:
+        while True:
+            try:
+                item = run_async(agen.__anext__())
+            except StopAsyncIteration:
+                return
+            yield item
+    finally:
+        run_async(agen.aclose())
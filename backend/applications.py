@@ -0,0 +1,304 @@
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from backend.aio import ASYNC_GRAPH, iter_async
+from backend.db import db
+from backend.graph import PIPELINE, covered_nodes
+from backend.models import Application
+from backend.quotas import record_tokens
+
+STALE_RUN_MINUTES = int(os.getenv("STALE_RUN_MINUTES", "15"))
+
+# finished runs still absorb duplicates (browser retries) for this long
+SINGLE_FLIGHT_WINDOW_SECONDS = int(os.getenv("SINGLE_FLIGHT_WINDOW_SECONDS", "60"))
+
+def candidate_profile(user: Dict[str, Any]) -> str:
+    return json.dumps({
+        "name": user.get("name"),
+        "headline": user.get("headline"),
+        "location": user.get("location"),
+        "key_skills": user.get("key_skills", []),
+        "constraints": user.get("constraints"),
+    })
+
+
+def fit_from_application(row: Application) -> Dict[str, Any]:
+    return {
+        "score": row.fit_score,
+        "level": row.fit_level,
+        "reasons": json.loads(row.fit_reasons or "[]"),
+        "gaps": json.loads(row.fit_gaps or "[]"),
+    }
+
+
+def state_from_application(row: Application) -> Dict[str, Any]:
+    """
+    Rebuilds graph state from a stored application so single nodes can be re-run.
+    Rows saved before candidate_profile existed fall back to empty profile fields.
+    """
+    profile = json.loads(row.candidate_profile or "{}")
+
+    state = {
+        "user": {
+            "name": profile.get("name") or "Candidate",
+            "headline": profile.get("headline") or "",
+            "location": profile.get("location") or "",
+            "resume_text": row.resume_text,
+            "key_skills": profile.get("key_skills") or [],
+            "constraints": profile.get("constraints") or "",
+        },
+        "job": {
+            "title": row.job_title,
+            "company": row.job_company,
+            "location": row.job_location,
+            "description": row.job_description,
+            "source_url": row.job_url,
+        },
+        "questions": row.questions.splitlines() if row.questions else [],
+        "fit": fit_from_application(row),
+    }
+
+    for key in ("job_parsed_markdown", "tailored_resume_md", "cover_letter", "qna"):
+        if getattr(row, key):
+            state[key] = getattr(row, key)
+
+    return state
+
+
+def apply_outputs(row: Application, result: Dict[str, Any], nodes: Iterable[str] = None) -> None:
+    """
+    Copies node outputs from graph state onto the row. Only the columns owned
+    by `nodes` are touched, so the UPDATE only includes what was regenerated.
+    """
+    nodes = set(nodes) if nodes is not None else set(PIPELINE)
+
+    if "parse_job" in nodes:
+        row.job_parsed_markdown = result.get("job_parsed_markdown")
+
+    if "score_fit" in nodes:
+        fit = result.get("fit", {})
+        row.fit_score = fit.get("score")
+        row.fit_level = fit.get("level")
+        row.fit_reasons = json.dumps(fit.get("reasons", []))
+        row.fit_gaps = json.dumps(fit.get("gaps", []))
+
+    if "resume_tailor" in nodes:
+        row.tailored_resume_md = result.get("tailored_resume_md")
+
+    if "cover_letter" in nodes:
+        row.cover_letter = result.get("cover_letter")
+
+    if "qna" in nodes:
+        row.qna = result.get("qna")
+
+
+def result_from_application(row: Application) -> Dict[str, Any]:
+    return {
+        "fit": fit_from_application(row),
+        "job_parsed_markdown": row.job_parsed_markdown,
+        "tailored_resume_md": row.tailored_resume_md,
+        "cover_letter": row.cover_letter,
+        "qna": row.qna,
+    }
+
+
+def request_key(user_id: int, resume_text: str, jd_text: str, questions: List[str]) -> str:
+    """
+    Identifies a /run submission: same user, resume, JD and questions.
+    """
+    parts = [
+        str(user_id),
+        hashlib.sha256(resume_text.strip().encode("utf-8")).hexdigest(),
+        hashlib.sha256(jd_text.strip().encode("utf-8")).hexdigest(),
+        "\n".join(questions),
+    ]
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def find_inflight(key: str) -> Optional[Application]:
+    """
+    The run a duplicate submission should attach to: one still in flight,
+    or one with the same key that started within the single-flight window.
+    """
+    row = Application.query.filter_by(inflight_key=key).first()
+    if row:
+        return row
+
+    since = datetime.utcnow() - timedelta(seconds=SINGLE_FLIGHT_WINDOW_SECONDS)
+    return (
+        Application.query.filter(Application.request_key == key, Application.created_at >= since)
+        .order_by(Application.created_at.desc())
+        .first()
+    )
+
+
+def pending_nodes(row: Application) -> List[str]:
+    return [n for n in (row.pending_nodes or "").split(",") if n]
+
+
+def is_cancelled(row: Application) -> bool:
+    # read straight from the DB: the cancel comes from another request
+    status = db.session.query(Application.status).filter_by(id=row.id).scalar()
+    return status == "cancelled"
+
+
+def mark_stale(row: Application) -> bool:
+    """
+    A row left "running" without progress for STALE_RUN_MINUTES lost its
+    worker (restart/crash). Marks it failed so it can be resumed.
+
+    The check and the write are one conditional UPDATE, so it can't race a
+    queued tail that claims the row in the meantime (see claim_queued_run).
+    """
+    if row.status != "running":
+        return False
+    if row.updated_at > datetime.utcnow() - timedelta(minutes=STALE_RUN_MINUTES):
+        return False
+
+    result = db.session.execute(
+        db.update(Application)
+        .where(
+            Application.id == row.id,
+            Application.status == "running",
+            Application.updated_at <= datetime.utcnow() - timedelta(minutes=STALE_RUN_MINUTES),
+        )
+        .values(status="failed", error="Run was interrupted.", inflight_key=None)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    return result.rowcount == 1
+
+
+def claim_queued_run(app_id: int, nodes: List[str]) -> Optional[Application]:
+    """
+    For a tail handed off while the row stayed in flight: returns the row if
+    it is still running, in flight and waiting for `nodes`, touching it so it
+    doesn't go stale. None once it was skipped, failed/marked stale (and
+    perhaps resumed by the user) in the meantime: running it would then
+    duplicate work.
+    """
+    result = db.session.execute(
+        db.update(Application)
+        .where(
+            Application.id == app_id,
+            Application.status == "running",
+            Application.inflight_key.isnot(None),
+        )
+        .values(updated_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    if result.rowcount != 1:
+        return None
+
+    row = db.session.get(Application, app_id)
+    if not set(nodes) <= set(pending_nodes(row)):
+        return None
+    return row
+
+
+def begin_run(row: Application, nodes: List[str]) -> Tuple[str, Optional[str]]:
+    """
+    Marks `row` running with `nodes` added to whatever was still pending, and
+    returns its previous (status, error) for end_run.
+    """
+    previous = (row.status, row.error)
+    pending = set(pending_nodes(row)) | set(nodes)
+
+    row.status = "running"
+    row.error = None
+    row.pending_nodes = ",".join(n for n in PIPELINE if n in pending)
+    db.session.commit()
+    return previous
+
+
+def checkpoint(row: Application, node: str, state: Dict[str, Any], tokens_seen: int) -> int:
+    """
+    Commits graph node `node`'s outputs to `row` and charges its LLM tokens
+    to the user's daily quota. Returns the running token count.
+    """
+    done = covered_nodes(node)
+    apply_outputs(row, state, done)
+
+    record_tokens(row.user_id, state.get("tokens_used", 0) - tokens_seen)
+    row.pending_nodes = ",".join(n for n in pending_nodes(row) if n not in done)
+    db.session.commit()
+    return state.get("tokens_used", 0)
+
+
+def release_run(row: Application) -> None:
+    # the row no longer absorbs duplicate submissions
+    row.inflight_key = None
+    db.session.commit()
+
+
+def fail_run(row: Application, error: Exception) -> None:
+    db.session.rollback()
+    row.status = "failed"
+    row.error = str(error)
+    release_run(row)
+
+
+def end_run(row: Application, previous: Tuple[str, Optional[str]]) -> None:
+    """
+    Completes `row`, unless nodes from an earlier unfinished run are still
+    pending: then it goes back to failed/cancelled so it can be resumed.
+    """
+    if pending_nodes(row):
+        status, error = previous
+        row.status = status if status in ("failed", "cancelled") else "failed"
+        row.error = error or "Run did not finish."
+    else:
+        row.status = "completed"
+        row.pending_nodes = None
+    release_run(row)
+
+
+def run_with_checkpoints(graph, state: Dict[str, Any], row: Application, nodes: Iterable[str] = None,
+                         use_async: bool = ASYNC_GRAPH, cancellable: bool = False,
+                         finalize: bool = True) -> Dict[str, Any]:
+    """
+    Streams `graph` and commits each node's output to `row` as soon as the
+    node finishes. If a node raises, the row is marked failed (completed
+    outputs stay saved) and the exception is re-raised so the caller can
+    report it; `pending_nodes` then says what a resume has to run.
+
+    With `use_async` the graph runs via astream on the shared event loop;
+    checkpoints are still committed from the calling thread. With
+    `cancellable` the run stops after the current node once the row was
+    marked cancelled.
+
+    Nodes still pending from an earlier run stay pending, so regenerating one
+    section of a failed/cancelled row doesn't hide what a resume must finish;
+    the row is only marked completed once nothing is left. With
+    `finalize=False` the row stays running and in flight after the last
+    node, for a follow-up run to finish (the progressive tail).
+    """
+    nodes = [n for n in PIPELINE if n in set(nodes)] if nodes is not None else list(PIPELINE)
+    previous = begin_run(row, nodes)
+
+    try:
+        if use_async:
+            chunks = iter_async(graph.astream(state, stream_mode="updates"))
+        else:
+            chunks = graph.stream(state, stream_mode="updates")
+
+        tokens_seen = state.get("tokens_used", 0)
+        for chunk in chunks:
+            for node, node_state in chunk.items():
+                state = node_state
+                tokens_seen = checkpoint(row, node, state, tokens_seen)
+
+            if cancellable and is_cancelled(row):
+                release_run(row)
+                return state
+    except Exception as e:
+        fail_run(row, e)
+        raise
+
+    if finalize:
+        end_run(row, previous)
+    return state
@@ -0,0 +1,213 @@
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+from pathlib import Path
+from typing import Dict, Optional
+
+import click
+import requests
+from flask import current_app, request, send_from_directory, url_for
+from flask.cli import with_appcontext
+
+try:  # optional: brotli variants are only built/served when installed
+    import brotli
+except ImportError:
+    brotli = None
+
+# hashed copies + precompressed variants live here (rebuilt by `flask assets build`)
+DIST_DIR = "dist"
+MANIFEST_NAME = "manifest.json"
+
+# only these get fingerprinted/compressed
+ASSET_EXTENSIONS = (".css", ".js", ".svg")
+COMPRESS_MIN_BYTES = 512
+
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+
+BOOTSTRAP_VERSION = os.getenv("BOOTSTRAP_VERSION", "5.3.3")
+_BOOTSTRAP_CDN = f"https://cdn.jsdelivr.net/npm/bootstrap@{BOOTSTRAP_VERSION}/dist"
+
+# vendored path -> CDN URL used until `flask assets build --vendor-bootstrap` has run
+VENDOR_CDN = {
+    "vendor/bootstrap.min.css": f"{_BOOTSTRAP_CDN}/css/bootstrap.min.css",
+    "vendor/bootstrap.bundle.min.js": f"{_BOOTSTRAP_CDN}/js/bootstrap.bundle.min.js",
+}
+
+# (suffix, Content-Encoding) in order of preference
+ENCODINGS = [(".br", "br"), (".gz", "gzip")]
+
+_manifest: Dict[str, str] = {}
+_manifest_mtime: Optional[float] = None
+
+
+# ----------------------------
+# Build
+# ----------------------------
+def minify_css(css: str) -> str:
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    css = re.sub(r":\s+", ":", css)
+    css = css.replace(";}", "}")
+    return css.strip()
+
+
+def _fingerprinted_name(rel_path: str, data: bytes) -> str:
+    digest = hashlib.sha256(data).hexdigest()[:12]
+    stem, ext = os.path.splitext(rel_path)
+    return f"{stem}.{digest}{ext}"
+
+
+def _write_variants(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    if len(data) < COMPRESS_MIN_BYTES:
+        return
+    # mtime=0 keeps the .gz byte-identical between builds
+    Path(str(path) + ".gz").write_bytes(gzip.compress(data, compresslevel=9, mtime=0))
+    if brotli is not None:
+        Path(str(path) + ".br").write_bytes(brotli.compress(data, quality=11))
+
+
+def build_assets(static_dir: Path, minify: bool = True) -> Dict[str, str]:
+    """
+    Copies every asset under `static_dir` to dist/ with a content hash in its
+    name (plus .gz/.br siblings) and writes the logical -> hashed manifest.
+    """
+    dist = static_dir / DIST_DIR
+    manifest = {}
+
+    for path in sorted(static_dir.rglob("*")):
+        if not path.is_file() or path.suffix not in ASSET_EXTENSIONS:
+            continue
+        rel = path.relative_to(static_dir).as_posix()
+        if rel.startswith(DIST_DIR + "/"):
+            continue
+
+        data = path.read_bytes()
+        if minify and path.suffix == ".css" and not path.name.endswith(".min.css"):
+            data = minify_css(data.decode("utf-8")).encode("utf-8")
+
+        hashed = _fingerprinted_name(rel, data)
+        _write_variants(dist / hashed, data)
+        manifest[rel] = hashed
+
+    dist.mkdir(parents=True, exist_ok=True)
+    (dist / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    return manifest
+
+
+def vendor_bootstrap(static_dir: Path) -> None:
+    for rel, url in VENDOR_CDN.items():
+        resp = requests.get(url, timeout=30)
+        resp.raise_for_status()
+        target = static_dir / rel
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(resp.content)
+
+
+# ----------------------------
+# Runtime
+# ----------------------------
+def load_manifest() -> Dict[str, str]:
+    """
+    Cached manifest; re-read only when the file changes (e.g. after a rebuild).
+    """
+    global _manifest, _manifest_mtime
+    path = Path(current_app.static_folder) / DIST_DIR / MANIFEST_NAME
+    try:
+        mtime = path.stat().st_mtime
+    except FileNotFoundError:
+        _manifest, _manifest_mtime = {}, None
+        return _manifest
+
+    if mtime != _manifest_mtime:
+        _manifest = json.loads(path.read_text())
+        _manifest_mtime = mtime
+    return _manifest
+
+
+def asset_url(filename: str) -> str:
+    """
+    URL of the fingerprinted copy when built, else the plain static file
+    (or the CDN for vendor files that haven't been downloaded).
+    """
+    hashed = load_manifest().get(filename)
+    if hashed:
+        return url_for("static", filename=f"{DIST_DIR}/{hashed}")
+    if filename in VENDOR_CDN and not (Path(current_app.static_folder) / filename).exists():
+        return VENDOR_CDN[filename]
+    return url_for("static", filename=filename)
+
+
+def _accepted_encodings() -> set:
+    header = request.headers.get("Accept-Encoding", "")
+    accepted = set()
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(name.strip().lower())
+    return accepted
+
+
+def serve_static(filename: str):
+    """
+    Replaces Flask's static view: fingerprinted files are served precompressed
+    with an immutable far-future Cache-Control; everything else as before.
+    """
+    if not filename.startswith(DIST_DIR + "/"):
+        return current_app.send_static_file(filename)
+
+    static_dir = current_app.static_folder
+    mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    accepted = _accepted_encodings()
+
+    for suffix, encoding in ENCODINGS:
+        if encoding in accepted and os.path.isfile(os.path.join(static_dir, filename + suffix)):
+            resp = send_from_directory(static_dir, filename + suffix, mimetype=mimetype, max_age=31536000)
+            resp.headers["Content-Encoding"] = encoding
+            break
+    else:
+        resp = send_from_directory(static_dir, filename, max_age=31536000)
+
+    resp.headers["Cache-Control"] = IMMUTABLE_CACHE
+    resp.headers["Vary"] = "Accept-Encoding"
+    return resp
+
+
+# ----------------------------
+# CLI: flask assets build
+# ----------------------------
+@click.group("assets")
+def assets_cli():
+    """Static asset pipeline."""
+
+
+@assets_cli.command("build")
+@click.option("--vendor-bootstrap", "vendor", is_flag=True, help=f"Download Bootstrap {BOOTSTRAP_VERSION} into static/vendor first.")
+@click.option("--no-minify", is_flag=True)
+@with_appcontext
+def build_command(vendor, no_minify):
+    """Fingerprint and precompress static files into static/dist."""
+    static_dir = Path(current_app.static_folder)
+    if vendor:
+        try:
+            vendor_bootstrap(static_dir)
+        except requests.RequestException as e:
+            raise click.ClickException(f"could not download Bootstrap: {e}")
+
+    manifest = build_assets(static_dir, minify=not no_minify)
+    for logical, hashed in manifest.items():
+        click.echo(f"{logical} -> {DIST_DIR}/{hashed}")
+    if brotli is None:
+        click.echo("brotli not installed; only .gz variants were written")
+
+
+def init_assets(app) -> None:
+    app.view_functions["static"] = serve_static
+    app.add_template_global(asset_url)
+    app.cli.add_command(assets_cli)
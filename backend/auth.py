@@ -1,12 +1,75 @@
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from functools import wraps
 
 from flask import session, redirect, url_for, flash, request
-from passlib.hash import bcrypt
+from passlib.context import CryptContext
 from sqlalchemy.exc import OperationalError
 
 from backend.models import User
 from backend.db import db
+from backend.process import PerProcess
+
+# ---- Password hashing ----
+# bcrypt cost per environment (each +1 doubles the work); 12 is passlib's default
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+# hashes running at once per worker process, and how many more may wait
+BCRYPT_THREADS = int(os.getenv("BCRYPT_THREADS", "2"))
+BCRYPT_QUEUE = int(os.getenv("BCRYPT_QUEUE", "16"))
+
+# hashes below BCRYPT_ROUNDS are upgraded on the next successful login
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    bcrypt__min_desired_rounds=BCRYPT_ROUNDS,
+)
+
+
+class AuthBusy(ValueError):
+    """Too many password hashes already queued in this worker."""
+
+
+def _new_pool():
+    return (
+        ThreadPoolExecutor(max_workers=BCRYPT_THREADS, thread_name_prefix="bcrypt"),
+        threading.BoundedSemaphore(BCRYPT_THREADS + BCRYPT_QUEUE),
+    )
+
+
+# one pool per worker process (re-created after fork)
+_pool = PerProcess(_new_pool)
+
+
+def _get_executor():
+    return _pool.get()
+
+
+def _offload(fn, *args):
+    """
+    Runs a bcrypt call on the bounded pool. bcrypt releases the GIL, so the
+    request threads keep serving other requests meanwhile; a login burst
+    beyond the queue is refused instead of pinning every core.
+    """
+    executor, slots = _get_executor()
+    if not slots.acquire(blocking=False):
+        raise AuthBusy("The server is busy. Please try again in a moment.")
+    try:
+        return executor.submit(fn, *args).result()
+    finally:
+        slots.release()
+
+
+def hash_password(password: str) -> str:
+    return _offload(pwd_context.hash, password)
+
+
+def verify_password(password: str, password_hash: str):
+    """
+    Returns (ok, new_hash); new_hash is set when the stored hash should be
+    replaced (e.g. its cost is below BCRYPT_ROUNDS).
+    """
+    return _offload(pwd_context.verify_and_update, password, password_hash)
 
 
 def is_logged_in() -> bool:
@@ -83,7 +146,7 @@ def create_user(email: str, password: str) -> User:
 
     user = User(
         email=email,
-        password_hash=bcrypt.hash(password),
+        password_hash=hash_password(password),
         status="pending",
         is_admin=False,
     )
@@ -98,9 +161,18 @@ def authenticate(email: str, password: str):
     if not user:
         return None
 
-    if not bcrypt.verify(password, user.password_hash):
+    try:
+        ok, new_hash = verify_password(password, user.password_hash)
+    except AuthBusy:
+        return "BUSY"
+    if not ok:
         return None
 
+    # transparently move old hashes to the current cost
+    if new_hash:
+        user.password_hash = new_hash
+        db.session.commit()
+
     # pending/blocked users cannot login (admins can)
     if user.status != "approved" and not user.is_admin:
         return "NOT_APPROVED"
@@ -137,7 +209,7 @@ def ensure_admin_seed():
 
         admin = User(
             email=admin_email,
-            password_hash=bcrypt.hash(admin_password),
+            password_hash=pwd_context.hash(admin_password),
             status="approved",
             is_admin=True,
         )
@@ -0,0 +1,183 @@
+import asyncio
+import logging
+import os
+import threading
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional
+
+from backend.aio import get_loop
+from backend.applications import (
+    begin_run,
+    checkpoint,
+    claim_queued_run,
+    end_run,
+    fail_run,
+    is_cancelled,
+    release_run,
+    run_with_checkpoints,
+    state_from_application,
+)
+from backend.db import db
+from backend.dedup import register as register_jd
+from backend.graph import get_partial_graph
+from backend.models import Application
+from backend.process import PerProcess
+from backend.quotas import weight_for
+
+logger = logging.getLogger(__name__)
+
+BACKGROUND_WORKERS = int(os.getenv("BACKGROUND_WORKERS", "4"))
+
+
+class FairScheduler:
+    """
+    Weighted fair queue for background pipeline work: the progressive
+    tails handed off by /run (PROGRESSIVE_RESULTS). Work done inside a
+    request, or as an async-mode task, doesn't pass through it.
+
+    Each user has a FIFO; idle workers always serve the user with the lowest
+    virtual time (jobs started / weight). One user's batch of submissions
+    therefore can't starve everyone else, and higher tiers get
+    proportionally more turns. Users joining the queue start at the current
+    virtual clock, so idle time doesn't bank credit.
+    """
+
+    def __init__(self, workers: int):
+        self._cv = threading.Condition()
+        self._queues: Dict[int, deque] = {}
+        self._vtime: Dict[int, float] = {}
+        self._clock = 0.0
+
+        for i in range(workers):
+            threading.Thread(target=self._work, name=f"pipeline-{i}", daemon=True).start()
+
+    def submit(self, user_id: int, weight: int, fn: Callable, *args) -> Future:
+        future = Future()
+        with self._cv:
+            if user_id not in self._queues:
+                self._queues[user_id] = deque()
+                self._vtime[user_id] = max(self._vtime.get(user_id, 0.0), self._clock)
+            self._queues[user_id].append((future, weight, fn, args))
+            self._cv.notify()
+        return future
+
+    def queued(self) -> Dict[int, int]:
+        with self._cv:
+            return {uid: len(q) for uid, q in self._queues.items()}
+
+    def _next(self):
+        with self._cv:
+            while not self._queues:
+                self._cv.wait()
+
+            user_id = min(self._queues, key=lambda uid: self._vtime[uid])
+            queue = self._queues[user_id]
+            future, weight, fn, args = queue.popleft()
+            if not queue:
+                del self._queues[user_id]
+
+            self._clock = self._vtime[user_id]
+            self._vtime[user_id] += 1.0 / max(weight, 1)
+            return future, fn, args
+
+    def _work(self):
+        while True:
+            future, fn, args = self._next()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args))
+            except BaseException as e:
+                future.set_exception(e)
+
+
+# one scheduler per worker process (re-created after fork)
+_scheduler = PerProcess(lambda: FairScheduler(BACKGROUND_WORKERS))
+
+
+def get_scheduler() -> FairScheduler:
+    return _scheduler.get()
+
+
+def finish_application(app, app_id: int, nodes: List[str]) -> None:
+    """
+    Runs the remaining `nodes` of a stored application outside the request,
+    checkpointing into the row. Stops early if the user skips the rest, and
+    doesn't start at all if the row stopped waiting for these nodes while
+    the job was queued.
+    """
+    with app.app_context():
+        row = claim_queued_run(app_id, nodes)
+        if row is None:
+            db.session.remove()
+            return
+
+        state = state_from_application(row)
+        try:
+            run_with_checkpoints(get_partial_graph(tuple(nodes)), state, row, nodes, cancellable=True)
+        except Exception:
+            # already recorded on the row as failed; resumable from the UI
+            logger.exception("Background run failed for application %s", app_id)
+        finally:
+            db.session.remove()
+
+
+def submit_remaining(app, app_id: int, user_id: int, nodes: List[str]) -> Future:
+    return get_scheduler().submit(user_id, weight_for(user_id), finish_application, app, app_id, nodes)
+
+
+# ----------------------------
+# Async mode: whole runs on the shared event loop
+# ----------------------------
+def _with_row(app, app_id: int, fn: Callable, *args):
+    # short-lived app context (and DB session) per step, on a worker thread
+    with app.app_context():
+        return fn(db.session.get(Application, app_id), *args)
+
+
+async def arun_application(app, app_id: int, state: Dict[str, Any], nodes: List[str],
+                           jd_fp: Optional[Dict] = None) -> Dict[str, Any]:
+    """
+    Runs `nodes` of a stored application as a task on the shared event
+    loop, so no thread is held while waiting on the LLM. Checkpoints are
+    the same as run_with_checkpoints', committed via asyncio.to_thread so
+    DB I/O never blocks the loop. A new JD is registered for dedup once
+    parsed.
+    """
+    def step(fn: Callable, *args):
+        return asyncio.to_thread(_with_row, app, app_id, fn, *args)
+
+    previous = await step(begin_run, nodes)
+    agen = get_partial_graph(tuple(nodes)).astream(state, stream_mode="updates")
+    tokens_seen = state.get("tokens_used", 0)
+    try:
+        async for chunk in agen:
+            for node, node_state in chunk.items():
+                state = node_state
+                tokens_seen = await step(checkpoint, node, state, tokens_seen)
+
+            if await step(is_cancelled):
+                await step(release_run)
+                return state
+    except Exception as e:
+        logger.exception("Async run failed for application %s", app_id)
+        await step(fail_run, e)
+        return state
+    finally:
+        await agen.aclose()
+        if jd_fp and state.get("job_parsed_markdown"):
+            await asyncio.to_thread(_register_jd, app, jd_fp, state["job"], state["job_parsed_markdown"])
+
+    await step(end_run, previous)
+    return state
+
+
+def _register_jd(app, jd_fp: Dict, job: Dict, job_parsed_markdown: str) -> None:
+    with app.app_context():
+        register_jd(jd_fp, job, job_parsed_markdown)
+
+
+def submit_async(app, app_id: int, state: Dict[str, Any], nodes: List[str],
+                 jd_fp: Optional[Dict] = None) -> Future:
+    return asyncio.run_coroutine_threadsafe(arun_application(app, app_id, state, nodes, jd_fp), get_loop())
@@ -1,11 +1,103 @@
+import logging
+import os
+import time
+from collections import Counter
 
+from flask import g, has_request_context, request
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 
 db = SQLAlchemy()
 migrate = Migrate()
 
+logger = logging.getLogger(__name__)
+
+# ---- Query instrumentation config ----
+SLOW_QUERY_MS = float(os.getenv("DB_SLOW_QUERY_MS", "200"))
+NPLUSONE_THRESHOLD = int(os.getenv("DB_NPLUSONE_THRESHOLD", "10"))
+QUERY_HEADER = os.getenv("DB_QUERY_HEADER", "0") == "1"
+
+
+def engine_options(db_url: str) -> dict:
+    """
+    Pool settings for server databases (Postgres on Render), from env vars.
+    SQLite keeps SQLAlchemy's defaults.
+    """
+    if db_url.startswith("sqlite"):
+        return {}
+
+    return {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        "pool_timeout": int(os.getenv("DB_POOL_TIMEOUT", "30")),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "1") == "1",
+    }
+
+
 def init_db(app):
     # By now, app.config["SQLALCHEMY_DATABASE_URI"] must already be set in app.py
+    app.config.setdefault(
+        "SQLALCHEMY_ENGINE_OPTIONS",
+        engine_options(app.config["SQLALCHEMY_DATABASE_URI"]),
+    )
     db.init_app(app)
     migrate.init_app(app, db)
+    init_query_stats(app)
+
+
+# ----------------------------
+# Per-request query counting
+# ----------------------------
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed_ms = (time.perf_counter() - conn.info["query_start"].pop()) * 1000
+
+    if elapsed_ms >= SLOW_QUERY_MS:
+        logger.warning("Slow query (%.1f ms): %s", elapsed_ms, statement)
+
+    # only count queries made while handling a request
+    if not has_request_context():
+        return
+
+    g.db_query_count = g.get("db_query_count", 0) + 1
+    g.db_query_ms = g.get("db_query_ms", 0.0) + elapsed_ms
+    g.setdefault("db_statements", Counter())[statement] += 1
+
+
+def _warn_nplusone(stats, method: str, path: str) -> None:
+    # the same statement over and over usually means a lazy load per row
+    for statement, times in stats.get("db_statements", Counter()).items():
+        if times >= NPLUSONE_THRESHOLD:
+            logger.warning(
+                "Possible N+1 on %s %s: statement ran %d times: %s",
+                method, path, times, statement,
+            )
+
+
+def init_query_stats(app):
+    @app.after_request
+    def _report_query_stats(response):
+        # A streamed body (e.g. exports) runs its queries after this hook,
+        # still counted into the same g; check them once the response closes.
+        # Its headers are already sent by then, so it gets no X-DB-Queries.
+        if response.is_streamed:
+            stats = g._get_current_object()
+            method, path = request.method, request.path
+            response.call_on_close(lambda: _warn_nplusone(stats, method, path))
+            return response
+
+        _warn_nplusone(g, request.method, request.path)
+
+        if QUERY_HEADER or app.debug:
+            count = g.get("db_query_count", 0)
+            total_ms = g.get("db_query_ms", 0.0)
+            response.headers["X-DB-Queries"] = f"{count}; time={total_ms:.1f}ms"
+        return response
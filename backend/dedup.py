@@ -0,0 +1,218 @@
+import hashlib
+import json
+import os
+import re
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy.exc import IntegrityError
+
+from backend.db import db
+from backend.models import JobSignature, JobSignatureBucket
+
+JD_DEDUP_ENABLED = os.getenv("JD_DEDUP", "1") == "1"
+JD_DEDUP_THRESHOLD = float(os.getenv("JD_DEDUP_THRESHOLD", "0.9"))
+
+# 16 bands x 8 rows: candidate pairs start showing up around ~0.7 similarity,
+# the exact threshold is checked on the full signature afterwards
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 5
+
+_MERSENNE = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def _permutations():
+    # fixed seeds: signatures must stay comparable across processes and deploys
+    perms = []
+    for i in range(NUM_PERM):
+        digest = hashlib.sha256(f"jd-minhash-{i}".encode()).digest()
+        a = int.from_bytes(digest[:8], "big") % (_MERSENNE - 1) + 1
+        b = int.from_bytes(digest[8:16], "big") % _MERSENNE
+        perms.append((a, b))
+    return perms
+
+
+_PERMS = _permutations()
+
+
+def normalize_jd(jd_text: str) -> str:
+    text = re.sub(r"<[^>]+>", " ", jd_text)  # JD may be raw HTML when extraction failed
+    text = re.sub(r"[^a-z0-9]+", " ", text.lower())
+    return text.strip()
+
+
+def shingles(normalized: str) -> set:
+    words = normalized.split()
+    if len(words) < SHINGLE_SIZE:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+
+def minhash(shingle_set: set) -> List[int]:
+    if not shingle_set:
+        return [_MAX_HASH] * NUM_PERM
+
+    base = [
+        int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), "big")
+        for s in shingle_set
+    ]
+    return [
+        min(((a * x + b) % _MERSENNE) & _MAX_HASH for x in base)
+        for a, b in _PERMS
+    ]
+
+
+def similarity(sig_a: List[int], sig_b: List[int]) -> float:
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / NUM_PERM
+
+
+def band_buckets(sig: List[int]) -> List[str]:
+    return [
+        hashlib.blake2b(
+            ",".join(map(str, sig[band * ROWS:(band + 1) * ROWS])).encode(), digest_size=8
+        ).hexdigest()
+        for band in range(BANDS)
+    ]
+
+
+def fingerprint(jd_text: str) -> Dict:
+    normalized = normalize_jd(jd_text)
+    sig = minhash(shingles(normalized))
+    return {
+        "content_hash": hashlib.sha256(normalized.encode()).hexdigest(),
+        "minhash": sig,
+        "buckets": band_buckets(sig),
+    }
+
+
+def _representative(sig: JobSignature) -> JobSignature:
+    if sig.cluster_id and sig.cluster_id != sig.id:
+        return db.session.get(JobSignature, sig.cluster_id) or sig
+    return sig
+
+
+def find_duplicate(fp: Dict) -> Optional[JobSignature]:
+    """
+    Returns the cluster representative of the closest stored JD whose
+    estimated Jaccard similarity is above JD_DEDUP_THRESHOLD, or None.
+    """
+    exact = JobSignature.query.filter_by(content_hash=fp["content_hash"]).first()
+    if exact:
+        return _representative(exact)
+
+    conditions = [
+        db.and_(JobSignatureBucket.band == band, JobSignatureBucket.bucket == bucket)
+        for band, bucket in enumerate(fp["buckets"])
+    ]
+    candidate_ids = {
+        r.signature_id
+        for r in JobSignatureBucket.query.with_entities(JobSignatureBucket.signature_id)
+        .filter(db.or_(*conditions))
+        .distinct()
+    }
+    if not candidate_ids:
+        return None
+
+    best, best_score = None, 0.0
+    for cand in JobSignature.query.filter(JobSignature.id.in_(candidate_ids)):
+        score = similarity(fp["minhash"], json.loads(cand.minhash))
+        if score > best_score:
+            best, best_score = cand, score
+
+    if best is None or best_score < JD_DEDUP_THRESHOLD:
+        return None
+    return _representative(best)
+
+
+def record_hit(rep: JobSignature, fp: Dict) -> None:
+    """
+    Counts a reuse of `rep`; a near-duplicate (not byte-identical after
+    normalization) is added to the cluster so later lookups can match it too.
+    """
+    # one UPDATE, so concurrent hits on the same JD don't lose increments
+    db.session.execute(
+        db.update(JobSignature)
+        .where(JobSignature.id == rep.id)
+        .values(hit_count=JobSignature.hit_count + 1, last_seen_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+
+    if not JobSignature.query.filter_by(content_hash=fp["content_hash"]).first():
+        _add_signature(fp, cluster_id=rep.id)
+
+    db.session.commit()
+
+
+def register(fp: Dict, job: Dict, job_parsed_markdown: str) -> Optional[JobSignature]:
+    """
+    Stores a freshly parsed JD as a new cluster representative. The parse
+    is reused for other users' runs, so it must come from the resume-free
+    parse_job prompt (never structured parse_and_score output).
+    """
+    if not job_parsed_markdown:
+        return None
+    if JobSignature.query.filter_by(content_hash=fp["content_hash"]).first():
+        return None
+
+    sig = _add_signature(
+        fp,
+        job_title=job.get("title"),
+        job_company=job.get("company"),
+        job_location=job.get("location"),
+        job_parsed_markdown=job_parsed_markdown,
+    )
+    db.session.commit()
+    return sig
+
+
+def _add_signature(fp: Dict, cluster_id: Optional[int] = None, **fields) -> Optional[JobSignature]:
+    """
+    Inserts the signature and its band buckets; without `cluster_id` it
+    starts its own cluster. Returns None if the same JD was stored
+    concurrently by another request.
+    """
+    try:
+        with db.session.begin_nested():
+            sig = JobSignature(
+                content_hash=fp["content_hash"],
+                minhash=json.dumps(fp["minhash"]),
+                cluster_id=cluster_id,
+                **fields,
+            )
+            db.session.add(sig)
+            db.session.flush()
+            if cluster_id is None:
+                sig.cluster_id = sig.id
+            # one executemany for all bands instead of an INSERT ... RETURNING per row
+            db.session.execute(
+                db.insert(JobSignatureBucket),
+                [
+                    {"signature_id": sig.id, "band": band, "bucket": bucket}
+                    for band, bucket in enumerate(fp["buckets"])
+                ],
+            )
+    except IntegrityError:
+        return None  # content_hash is unique: someone else registered it first
+    return sig
+
+
+def duplicate_clusters(limit: int = 100):
+    """
+    Cluster representatives that were reused at least once, with member counts.
+    """
+    members = (
+        db.session.query(JobSignature.cluster_id, db.func.count(JobSignature.id).label("members"))
+        .group_by(JobSignature.cluster_id)
+        .subquery()
+    )
+    return (
+        db.session.query(JobSignature, members.c.members)
+        .join(members, members.c.cluster_id == JobSignature.id)
+        .filter(db.or_(JobSignature.hit_count > 0, members.c.members > 1))
+        .order_by(JobSignature.hit_count.desc(), JobSignature.last_seen_at.desc())
+        .limit(limit)
+        .all()
+    )
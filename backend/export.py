@@ -0,0 +1,124 @@
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional
+
+from sqlalchemy import select
+
+from backend.db import db
+from backend.models import Application
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "jsonl": "application/x-ndjson",
+}
+
+# single-flight keys and raw error text are internal bookkeeping, not user data
+INTERNAL_COLUMNS = {"request_key", "inflight_key", "error"}
+
+EXPORT_COLUMNS = [c.name for c in Application.__table__.columns if c.name not in INTERNAL_COLUMNS]
+
+# spreadsheet apps evaluate cells starting with these as formulas
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+# rows fetched per round-trip; the DB driver streams them through a server-side cursor
+BATCH_SIZE = 500
+
+
+def _parse_date(value: str, field: str) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        raise ValueError(f"Invalid {field} date '{value}'. Use YYYY-MM-DD.")
+
+
+def parse_export_args(args) -> Dict[str, Any]:
+    """
+    Validates query-string options shared by the export endpoints.
+    Raises ValueError with a user-facing message.
+    """
+    fmt = args.get("format", "csv").strip().lower()
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format '{fmt}'. Use csv or jsonl.")
+
+    columns_raw = args.get("columns", "").strip()
+    columns = [c.strip() for c in columns_raw.split(",") if c.strip()] or list(EXPORT_COLUMNS)
+    unknown = [c for c in columns if c not in EXPORT_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown export columns: {', '.join(unknown)}")
+
+    start = _parse_date(args.get("start", "").strip(), "start")
+    end = _parse_date(args.get("end", "").strip(), "end")
+    if end:
+        end = end + timedelta(days=1)  # inclusive end date
+
+    return {"format": fmt, "columns": columns, "start": start, "end": end}
+
+
+def iter_applications(columns: List[str], user_id: int = None, start: datetime = None,
+                      end: datetime = None) -> Iterator[Dict[str, Any]]:
+    """
+    Yields applications as plain dicts, oldest first. Only the selected
+    columns are fetched and rows are streamed in batches, so memory stays
+    flat regardless of how many rows match.
+    """
+    table = Application.__table__
+    stmt = select(*[table.c[name] for name in columns]).order_by(table.c.id)
+    if user_id is not None:
+        stmt = stmt.where(table.c.user_id == user_id)
+    if start:
+        stmt = stmt.where(table.c.created_at >= start)
+    if end:
+        stmt = stmt.where(table.c.created_at < end)
+
+    result = db.session.execute(stmt.execution_options(yield_per=BATCH_SIZE))
+    for row in result:
+        yield dict(row._mapping)
+
+
+def _cell(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _csv_cell(value: Any) -> Any:
+    value = _cell(value)
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value  # shown as text instead of run as a formula
+    return value
+
+
+def to_csv(rows: Iterator[Dict[str, Any]], columns: List[str]) -> Iterator[str]:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+
+    writer.writerow(columns)
+    for row in rows:
+        writer.writerow([_csv_cell(row[c]) for c in columns])
+        yield buf.getvalue()
+        buf.seek(0)
+        buf.truncate(0)
+
+    # header only when there were no rows
+    if buf.tell():
+        yield buf.getvalue()
+
+
+def to_jsonl(rows: Iterator[Dict[str, Any]], columns: List[str]) -> Iterator[str]:
+    for row in rows:
+        yield json.dumps({c: _cell(row[c]) for c in columns}) + "\n"
+
+
+def export_stream(opts: Dict[str, Any], user_id: int = None) -> Iterator[str]:
+    rows = iter_applications(opts["columns"], user_id=user_id, start=opts["start"], end=opts["end"])
+    if opts["format"] == "jsonl":
+        return to_jsonl(rows, opts["columns"])
+    return to_csv(rows, opts["columns"])
+
+
+def export_filename(opts: Dict[str, Any], prefix: str = "applications") -> str:
+    return f"{prefix}-{datetime.utcnow().strftime('%Y%m%d-%H%M%S')}.{opts['format']}"
@@ -1,41 +1,85 @@
+import os
 from pathlib import Path
+from typing import Tuple
+
 import requests
 import trafilatura
+from bs4 import BeautifulSoup
 from pypdf import PdfReader
 import docx
 
-def extract_text_from_pdf(path: str) -> str:
+# Input limits: keep prompts (and the per-run graph state) bounded
+RESUME_MAX_PAGES = int(os.getenv("RESUME_MAX_PAGES", "10"))
+RESUME_MAX_CHARS = int(os.getenv("RESUME_MAX_CHARS", "30000"))
+JD_MAX_CHARS = int(os.getenv("JD_MAX_CHARS", "20000"))
+JD_FETCH_MAX_BYTES = int(os.getenv("JD_FETCH_MAX_BYTES", str(2 * 1024 * 1024)))
+
+
+def clip_text(text: str, limit: int) -> Tuple[str, bool]:
+    """
+    Returns (text cut to `limit` characters, whether anything was cut).
+    """
+    if limit and len(text) > limit:
+        return text[:limit].rstrip(), True
+    return text, False
+
+def extract_text_from_pdf(path: str, max_pages: int = None) -> Tuple[str, bool]:
     reader = PdfReader(path)
+    total = len(reader.pages)
+    count = min(total, max_pages) if max_pages else total
     parts = []
-    for page in reader.pages:
-        parts.append(page.extract_text() or "")
-    return "\n".join(parts).strip()
+    for i in range(count):
+        parts.append(reader.pages[i].extract_text() or "")
+    return "\n".join(parts).strip(), count < total
 
-def extract_text_from_docx(path: str) -> str:
+def extract_text_from_docx(path: str, max_chars: int = None) -> str:
     d = docx.Document(path)
-    return "\n".join(p.text for p in d.paragraphs).strip()
+    parts, size = [], 0
+    for p in d.paragraphs:
+        parts.append(p.text)
+        size += len(p.text) + 1
+        if max_chars and size > max_chars:
+            break
+    return "\n".join(parts).strip()
 
-def extract_text_from_txt(path: str) -> str:
-    return Path(path).read_text(encoding="utf-8", errors="ignore").strip()
+def extract_text_from_txt(path: str, max_chars: int = None) -> str:
+    with open(path, encoding="utf-8", errors="ignore") as f:
+        return f.read(max_chars + 1 if max_chars else -1).strip()
 
-def load_resume_text(file_path: str) -> str:
+def load_resume_text(file_path: str) -> Tuple[str, bool]:
+    """
+    Returns (resume text, truncated) — at most RESUME_MAX_PAGES PDF pages
+    and RESUME_MAX_CHARS characters are kept.
+    """
     ext = Path(file_path).suffix.lower()
+    pages_cut = False
     if ext == ".pdf":
-        return extract_text_from_pdf(file_path)
-    if ext == ".docx":
-        return extract_text_from_docx(file_path)
-    if ext in [".txt", ".md"]:
-        return extract_text_from_txt(file_path)
-    raise ValueError(f"Unsupported resume file type: {ext}. Use PDF/DOCX/TXT")
+        text, pages_cut = extract_text_from_pdf(file_path, RESUME_MAX_PAGES)
+    elif ext == ".docx":
+        text = extract_text_from_docx(file_path, RESUME_MAX_CHARS)
+    elif ext in [".txt", ".md"]:
+        text = extract_text_from_txt(file_path, RESUME_MAX_CHARS)
+    else:
+        raise ValueError(f"Unsupported resume file type: {ext}. Use PDF/DOCX/TXT")
+
+    text, chars_cut = clip_text(text, RESUME_MAX_CHARS)
+    return text, pages_cut or chars_cut
 
 def fetch_job_description_from_url(url: str, timeout: int = 20) -> str:
     headers = {"User-Agent": "Mozilla/5.0"}
-    r = requests.get(url, headers=headers, timeout=timeout)
-    r.raise_for_status()
+    with requests.get(url, headers=headers, timeout=timeout, stream=True) as r:
+        r.raise_for_status()
+        # stop reading oversized pages instead of buffering them whole
+        body = bytearray()
+        for chunk in r.iter_content(64 * 1024):
+            body.extend(chunk)
+            if len(body) >= JD_FETCH_MAX_BYTES:
+                break
+        html = bytes(body[:JD_FETCH_MAX_BYTES]).decode(r.encoding or "utf-8", errors="ignore")
 
-    extracted = trafilatura.extract(r.text, include_comments=False, include_tables=False)
+    extracted = trafilatura.extract(html, include_comments=False, include_tables=False)
     if extracted and len(extracted.strip()) > 200:
         return extracted.strip()
 
-    # fallback: return html if extraction fails
-    return r.text
+    # fallback: visible page text (raw HTML would mostly be markup in the prompts)
+    return BeautifulSoup(html, "html.parser").get_text(" ", strip=True)
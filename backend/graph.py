@@ -1,11 +1,18 @@
-from typing import Dict, Any, List
+import os
+from functools import lru_cache
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 import json
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import StateGraph, END
+from . import structured
 from .llm import get_llm
 
 llm = get_llm()
 
-def parse_job_node(state: Dict[str, Any]) -> Dict[str, Any]:
+# One JSON-mode call for parse_job + score_fit instead of two free-text calls
+STRUCTURED_PARSE_FIT = os.getenv("STRUCTURED_PARSE_FIT", "0") == "1"
+
+def parse_job_prompt(state: Dict[str, Any]) -> str:
     job = state["job"]
     prompt = f"""
 You are a hiring expert.
@@ -27,10 +34,9 @@ TASKS:
 
 Respond in markdown.
 """
-    state["job_parsed_markdown"] = llm.invoke(prompt).content
-    return state
+    return prompt
 
-def score_fit_node(state: Dict[str, Any]) -> Dict[str, Any]:
+def score_fit_prompt(state: Dict[str, Any]) -> str:
     user = state["user"]
     job = state["job"]
     prompt = f"""
@@ -64,7 +70,9 @@ Return JSON only:
   "gaps": ["...", "..."]
 }}
 """
-    text = llm.invoke(prompt).content
+    return prompt
+
+def parse_fit(text: str) -> Dict[str, Any]:
     start, end = text.find("{"), text.rfind("}")
     json_str = text[start:end+1] if start != -1 and end != -1 else text
 
@@ -73,10 +81,9 @@ Return JSON only:
     except json.JSONDecodeError:
         fit = {"score": 60, "level": "Unknown", "reasons": [text], "gaps": []}
 
-    state["fit"] = fit
-    return state
+    return fit
 
-def resume_tailor_node(state: Dict[str, Any]) -> Dict[str, Any]:
+def resume_tailor_prompt(state: Dict[str, Any]) -> str:
     user = state["user"]
     job = state["job"]
     prompt = f"""
@@ -100,10 +107,9 @@ TASK:
 
 Output markdown with headings.
 """
-    state["tailored_resume_md"] = llm.invoke(prompt).content
-    return state
+    return prompt
 
-def cover_letter_node(state: Dict[str, Any]) -> Dict[str, Any]:
+def cover_letter_prompt(state: Dict[str, Any]) -> str:
     user = state["user"]
     job = state["job"]
     fit = state["fit"]
@@ -140,13 +146,12 @@ Write a tailored cover letter (350–450 words):
 
 Output ONLY the letter text.
 """
-    state["cover_letter"] = llm.invoke(prompt).content
-    return state
+    return prompt
 
-def qna_node(state: Dict[str, Any]) -> Dict[str, Any]:
+def qna_prompt(state: Dict[str, Any]) -> Optional[str]:
     questions: List[str] = state.get("questions", [])
     if not questions:
-        return state
+        return None
 
     user = state["user"]
     job = state["job"]
@@ -177,21 +182,215 @@ QUESTIONS:
 TASK:
 Answer each question in 3–6 sentences with numbered answers.
 """
-    state["qna"] = llm.invoke(prompt).content
+    return prompt
+
+# ----------------------------
+# Nodes: sync for invoke/stream, async for ainvoke/astream
+# ----------------------------
+def _text(state: Dict[str, Any], message) -> str:
+    # running token count for quotas (see run_with_checkpoints)
+    usage = getattr(message, "usage_metadata", None) or {}
+    state["tokens_used"] = state.get("tokens_used", 0) + usage.get("total_tokens", 0)
+    return message.content
+
+def parse_job_node(state: Dict[str, Any]) -> Dict[str, Any]:
+    state["job_parsed_markdown"] = _text(state, llm.invoke(parse_job_prompt(state)))
+    return state
+
+async def aparse_job_node(state: Dict[str, Any]) -> Dict[str, Any]:
+    state["job_parsed_markdown"] = _text(state, await llm.ainvoke(parse_job_prompt(state)))
+    return state
+
+def score_fit_node(state: Dict[str, Any]) -> Dict[str, Any]:
+    state["fit"] = parse_fit(_text(state, llm.invoke(score_fit_prompt(state))))
     return state
 
-def build_job_graph():
+async def ascore_fit_node(state: Dict[str, Any]) -> Dict[str, Any]:
+    state["fit"] = parse_fit(_text(state, await llm.ainvoke(score_fit_prompt(state))))
+    return state
+
+def resume_tailor_node(state: Dict[str, Any]) -> Dict[str, Any]:
+    state["tailored_resume_md"] = _text(state, llm.invoke(resume_tailor_prompt(state)))
+    return state
+
+async def aresume_tailor_node(state: Dict[str, Any]) -> Dict[str, Any]:
+    state["tailored_resume_md"] = _text(state, await llm.ainvoke(resume_tailor_prompt(state)))
+    return state
+
+def cover_letter_node(state: Dict[str, Any]) -> Dict[str, Any]:
+    state["cover_letter"] = _text(state, llm.invoke(cover_letter_prompt(state)))
+    return state
+
+async def acover_letter_node(state: Dict[str, Any]) -> Dict[str, Any]:
+    state["cover_letter"] = _text(state, await llm.ainvoke(cover_letter_prompt(state)))
+    return state
+
+def qna_node(state: Dict[str, Any]) -> Dict[str, Any]:
+    prompt = qna_prompt(state)
+    if prompt is None:
+        return state
+    state["qna"] = _text(state, llm.invoke(prompt))
+    return state
+
+async def aqna_node(state: Dict[str, Any]) -> Dict[str, Any]:
+    prompt = qna_prompt(state)
+    if prompt is None:
+        return state
+    state["qna"] = _text(state, await llm.ainvoke(prompt))
+    return state
+
+def _json_llm():
+    return llm.bind(response_format={"type": "json_object"})
+
+def parse_and_score_node(state: Dict[str, Any]) -> Dict[str, Any]:
+    prompt = structured.parse_and_score_prompt(state)
+    text = _text(state, _json_llm().invoke(prompt))
+    try:
+        parsed = structured.validate(text)
+    except ValueError as e:
+        # one repair attempt; a second failure fails the node instead of faking a score
+        text = _text(state, _json_llm().invoke(structured.repair_prompt(text, e)))
+        parsed = structured.validate(text)
+    return structured.apply(state, parsed)
+
+async def aparse_and_score_node(state: Dict[str, Any]) -> Dict[str, Any]:
+    prompt = structured.parse_and_score_prompt(state)
+    text = _text(state, await _json_llm().ainvoke(prompt))
+    try:
+        parsed = structured.validate(text)
+    except ValueError as e:
+        text = _text(state, await _json_llm().ainvoke(structured.repair_prompt(text, e)))
+        parsed = structured.validate(text)
+    return structured.apply(state, parsed)
+
+# Pipeline order of the nodes in the job graph
+PIPELINE = ["parse_job", "score_fit", "resume_tailor", "cover_letter", "qna"]
+
+NODE_FUNCS = {
+    "parse_job": parse_job_node,
+    "score_fit": score_fit_node,
+    "resume_tailor": resume_tailor_node,
+    "cover_letter": cover_letter_node,
+    "qna": qna_node,
+}
+
+ASYNC_NODE_FUNCS = {
+    "parse_job": aparse_job_node,
+    "score_fit": ascore_fit_node,
+    "resume_tailor": aresume_tailor_node,
+    "cover_letter": acover_letter_node,
+    "qna": aqna_node,
+}
+
+# Nodes needed to show the fit decision; the rest is long-form writing
+FIT_NODES = ["parse_job", "score_fit"]
+
+# Merged nodes and the pipeline nodes whose outputs they produce
+MERGED_NODES = {
+    "parse_and_score": ["parse_job", "score_fit"],
+}
+
+MERGED_FUNCS = {
+    "parse_and_score": (parse_and_score_node, aparse_and_score_node),
+}
+
+# Nodes that read another node's output (cover_letter uses state["fit"])
+NODE_DEPENDENTS = {
+    "score_fit": ["cover_letter"],
+}
+
+
+def nodes_to_rerun(node: str) -> List[str]:
+    """
+    Returns `node` plus every node that depends on it, in pipeline order.
+    """
+    if node not in NODE_FUNCS:
+        raise ValueError(f"Unknown node: {node}")
+
+    selected = set()
+    pending = [node]
+    while pending:
+        n = pending.pop()
+        if n in selected:
+            continue
+        selected.add(n)
+        pending.extend(NODE_DEPENDENTS.get(n, []))
+
+    return [n for n in PIPELINE if n in selected]
+
+
+def covered_nodes(name: str) -> List[str]:
+    """
+    Pipeline nodes completed when graph node `name` finishes.
+    """
+    return MERGED_NODES.get(name, [name])
+
+
+# score_fit on its own (regenerate, or parse_job reused from a duplicate JD)
+def score_fit_structured_node(state: Dict[str, Any]) -> Dict[str, Any]:
+    text = _text(state, _json_llm().invoke(score_fit_prompt(state)))
+    try:
+        fit = structured.validate(text, structured.FitResult)
+    except ValueError as e:
+        text = _text(state, _json_llm().invoke(structured.repair_prompt(text, e, structured.FitResult)))
+        fit = structured.validate(text, structured.FitResult)
+    state["fit"] = fit.model_dump()
+    return state
+
+async def ascore_fit_structured_node(state: Dict[str, Any]) -> Dict[str, Any]:
+    text = _text(state, await _json_llm().ainvoke(score_fit_prompt(state)))
+    try:
+        fit = structured.validate(text, structured.FitResult)
+    except ValueError as e:
+        text = _text(state, await _json_llm().ainvoke(structured.repair_prompt(text, e, structured.FitResult)))
+        fit = structured.validate(text, structured.FitResult)
+    state["fit"] = fit.model_dump()
+    return state
+
+def build_job_graph(nodes: Iterable[str] = None, structured_mode: bool = None):
+    """
+    Builds the job graph as a linear chain. Pass `nodes` to build a graph
+    that only runs that subset (still in pipeline order). In structured
+    mode parse_job + score_fit run as the single parse_and_score node, and
+    a score_fit without parse_job is schema-validated the same way.
+    """
+    if structured_mode is None:
+        structured_mode = STRUCTURED_PARSE_FIT
+
+    wanted = set(nodes) if nodes is not None else set(PIPELINE)
+    unknown = wanted - set(NODE_FUNCS)
+    if unknown:
+        raise ValueError(f"Unknown nodes: {sorted(unknown)}")
+
+    chain = [n for n in PIPELINE if n in wanted]
+    if not chain:
+        raise ValueError("At least one node is required.")
+
+    funcs = {n: (NODE_FUNCS[n], ASYNC_NODE_FUNCS[n]) for n in chain}
+    if structured_mode:
+        for merged, parts in MERGED_NODES.items():
+            if all(p in chain for p in parts):
+                at = chain.index(parts[0])
+                chain = [n for n in chain if n not in parts]
+                chain.insert(at, merged)
+                funcs[merged] = MERGED_FUNCS[merged]
+        if "score_fit" in chain:
+            funcs["score_fit"] = (score_fit_structured_node, ascore_fit_structured_node)
+
     graph = StateGraph(dict)
-    graph.add_node("parse_job", parse_job_node)
-    graph.add_node("score_fit", score_fit_node)
-    graph.add_node("resume_tailor", resume_tailor_node)
-    graph.add_node("cover_letter", cover_letter_node)
-    graph.add_node("qna", qna_node)
-
-    graph.set_entry_point("parse_job")
-    graph.add_edge("parse_job", "score_fit")
-    graph.add_edge("score_fit", "resume_tailor")
-    graph.add_edge("resume_tailor", "cover_letter")
-    graph.add_edge("cover_letter", "qna")
-    graph.add_edge("qna", END)
+    for name in chain:
+        # sync body for invoke/stream, async body for ainvoke/astream
+        func, afunc = funcs[name]
+        graph.add_node(name, RunnableLambda(func, afunc=afunc, name=name))
+
+    graph.set_entry_point(chain[0])
+    for a, b in zip(chain, chain[1:]):
+        graph.add_edge(a, b)
+    graph.add_edge(chain[-1], END)
     return graph.compile()
+
+
+@lru_cache(maxsize=None)
+def get_partial_graph(nodes: Tuple[str, ...]):
+    # compiled subgraphs are reused across requests
+    return build_job_graph(nodes)
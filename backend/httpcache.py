@@ -0,0 +1,169 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from functools import wraps
+from pathlib import Path
+from typing import Any, Optional, Tuple
+
+from flask import current_app, make_response, request, session
+from sqlalchemy import select
+
+from backend.assets import load_manifest
+from backend.db import db
+from backend.models import Application
+
+# rendered pages kept per worker process
+PAGE_CACHE_SIZE = int(os.getenv("PAGE_CACHE_SIZE", "256"))
+PUBLIC_PAGE_MAX_AGE = int(os.getenv("PUBLIC_PAGE_MAX_AGE", "300"))
+
+# application pages are per-user: the browser keeps them but must revalidate
+PRIVATE_REVALIDATE = "private, no-cache"
+
+# set per deploy (Render provides RENDER_GIT_COMMIT); else the templates are hashed
+CODE_VERSION = os.getenv("APP_VERSION") or os.getenv("RENDER_GIT_COMMIT")
+
+
+class RenderCache:
+    """
+    Small thread-safe LRU of rendered HTML. Keys carry a version, so entries
+    never need invalidating: a changed row simply stops being looked up.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Any, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+page_cache = RenderCache(PAGE_CACHE_SIZE)
+
+
+def viewer_key() -> Tuple:
+    """
+    Everything base.html renders from the session (navbar), so cached HTML
+    is never shown to a different kind of viewer.
+    """
+    return (
+        session.get("user_id"),
+        session.get("user_email"),
+        bool(session.get("is_admin")),
+        session.get("user_status"),
+    )
+
+
+def cacheable_request() -> bool:
+    # pending flash messages are rendered into the page, so skip the cache
+    return request.method == "GET" and "_flashes" not in session and not current_app.debug
+
+
+def make_etag(*parts: Any) -> str:
+    raw = "|".join(str(p) for p in parts)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20]
+
+
+_code_version = None
+
+
+def _templates_digest() -> str:
+    root = Path(current_app.root_path) / current_app.template_folder
+    digest = hashlib.sha1()
+    for path in sorted(root.rglob("*")):
+        if path.is_file():
+            digest.update(path.relative_to(root).as_posix().encode("utf-8"))
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def build_version() -> str:
+    """
+    What the HTML is rendered with: the code version plus the asset manifest,
+    so validators and cached pages change with every deploy or asset build.
+    """
+    global _code_version
+    if _code_version is None:
+        _code_version = CODE_VERSION or _templates_digest()
+    return make_etag(_code_version, json.dumps(load_manifest(), sort_keys=True))
+
+
+def is_not_modified(etag: str) -> bool:
+    # ETag only: a Last-Modified date can't tell that a deploy changed the page
+    return bool(request.if_none_match) and request.if_none_match.contains_weak(etag)
+
+
+def conditional_response(body: Optional[str], etag: str, cache_control: str):
+    """
+    200 with `body`, or an empty 304 when `body` is None.
+    """
+    resp = make_response(body if body is not None else "", 200 if body is not None else 304)
+    resp.set_etag(etag, weak=True)
+    resp.headers["Cache-Control"] = cache_control
+    return resp
+
+
+# ----------------------------
+# Application pages
+# ----------------------------
+def application_version(app_id: int):
+    """
+    (user_id, status, updated_at) via a narrow primary-key lookup, enough to
+    answer a conditional request without loading the row's text columns.
+    """
+    return db.session.execute(
+        select(Application.user_id, Application.status, Application.updated_at)
+        .where(Application.id == app_id)
+    ).first()
+
+
+def application_etag(app_id: int, version) -> str:
+    return make_etag("app", app_id, build_version(), version.status, version.updated_at.isoformat(),
+                     *viewer_key())
+
+
+# ----------------------------
+# Public pages
+# ----------------------------
+def cached_page(view):
+    """
+    Renders a static page once per viewer kind and answers repeats from memory
+    (or with a 304). Anonymous visitors get a shared, publicly cacheable copy.
+    """
+    @wraps(view)
+    def wrapped(*args, **kwargs):
+        if not cacheable_request():
+            return view(*args, **kwargs)
+
+        key = ("page", request.endpoint, build_version(), viewer_key())
+        entry = page_cache.get(key)
+        if entry is None:
+            html = view(*args, **kwargs)
+            entry = (html, make_etag(html))
+            page_cache.set(key, entry)
+
+        html, etag = entry
+        if session.get("user_id"):
+            cache_control = f"private, max-age={PUBLIC_PAGE_MAX_AGE}"
+        else:
+            cache_control = f"public, max-age={PUBLIC_PAGE_MAX_AGE}"
+
+        if is_not_modified(etag):
+            return conditional_response(None, etag, cache_control)
+        return conditional_response(html, etag, cache_control)
+    return wrapped
@@ -6,12 +6,15 @@ load_dotenv()
 
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 GROQ_MODEL = os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile")
+# point at a Groq-compatible server instead of api.groq.com (e.g. bench/groq_stub.py)
+GROQ_BASE_URL = os.getenv("GROQ_BASE_URL") or None
 
-def get_llm(temperature: float = 0.3) -> ChatGroq:
+def get_llm(temperature: float = 0.3, model: str = None) -> ChatGroq:
     if not GROQ_API_KEY:
         raise ValueError("GROQ_API_KEY not set. Add it to .env")
     return ChatGroq(
         groq_api_key=GROQ_API_KEY,
-        model_name=GROQ_MODEL,
+        model_name=model or GROQ_MODEL,
+        groq_api_base=GROQ_BASE_URL,
         temperature=temperature,
     )
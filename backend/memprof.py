@@ -0,0 +1,58 @@
+import logging
+import os
+import resource
+import tracemalloc
+from functools import wraps
+
+from flask import request
+
+logger = logging.getLogger(__name__)
+
+# tracemalloc slows allocation-heavy code noticeably; enable only while profiling
+MEMORY_PROFILE = os.getenv("MEMORY_PROFILE", "0") == "1"
+# also log the N source lines that allocated most during the request
+MEMORY_PROFILE_TOP = int(os.getenv("MEMORY_PROFILE_TOP", "0"))
+
+_MB = 1024 * 1024
+
+
+def _max_rss_mb() -> float:
+    # ru_maxrss is KB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (_MB if os.uname().sysname == "Darwin" else 1024)
+
+
+def profile_memory(label: str):
+    """
+    Logs Python heap peak/retained memory for each call of the view.
+
+    tracemalloc's peak is process-wide, so with concurrent requests in one
+    worker it reads as "peak while this request ran" — which is what bounds
+    the worker's RSS anyway.
+    """
+    def decorator(view):
+        if not MEMORY_PROFILE:
+            return view
+
+        @wraps(view)
+        def wrapped(*args, **kwargs):
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            start, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            before = tracemalloc.take_snapshot() if MEMORY_PROFILE_TOP else None
+            try:
+                return view(*args, **kwargs)
+            finally:
+                current, peak = tracemalloc.get_traced_memory()
+                logger.info(
+                    "[memory] %s peak=+%.1f MB retained=%+.1f MB body=%s bytes maxrss=%.0f MB",
+                    label, (peak - start) / _MB, (current - start) / _MB,
+                    request.content_length, _max_rss_mb(),
+                )
+                if before is not None:
+                    stats = tracemalloc.take_snapshot().compare_to(before, "lineno")
+                    for stat in stats[:MEMORY_PROFILE_TOP]:
+                        logger.info("[memory]   %s", stat)
+        return wrapped
+    return decorator
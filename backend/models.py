@@ -13,6 +13,11 @@ class User(db.Model):
     status = db.Column(db.String(20), default="pending", nullable=False)  # pending/approved/blocked
     is_admin = db.Column(db.Boolean, default=False, nullable=False)
 
+    # quotas: tier defaults, optionally overridden per user
+    tier = db.Column(db.String(20), default="free", nullable=False)  # free/pro
+    daily_run_limit = db.Column(db.Integer, nullable=True)
+    daily_token_limit = db.Column(db.Integer, nullable=True)
+
     applications = db.relationship(
         "Application",
         backref="user",
@@ -39,6 +44,7 @@ class Application(db.Model):
     resume_text = db.Column(db.Text, nullable=False)
     job_description = db.Column(db.Text, nullable=False)
     questions = db.Column(db.Text, nullable=True)
+    candidate_profile = db.Column(db.Text, nullable=True)  # JSON: name/headline/location/key_skills/constraints
 
     # outputs
     fit_score = db.Column(db.Integer, nullable=True)
@@ -50,3 +56,56 @@ class Application(db.Model):
     tailored_resume_md = db.Column(db.Text, nullable=True)
     cover_letter = db.Column(db.Text, nullable=True)
     qna = db.Column(db.Text, nullable=True)
+
+    # pipeline progress, checkpointed after every node
+    status = db.Column(db.String(20), default="completed", nullable=False)  # running/failed/completed
+    pending_nodes = db.Column(db.String(255), nullable=True)  # comma-separated nodes still to run
+    error = db.Column(db.Text, nullable=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    # single-flight: identical /run submissions attach to the run in progress
+    request_key = db.Column(db.String(64), nullable=True, index=True)
+    inflight_key = db.Column(db.String(64), nullable=True, unique=True, index=True)  # cleared when the run ends
+
+class JobSignature(db.Model):
+    """
+    MinHash signature of a normalized JD plus the parse output that can be
+    reused for near-identical postings. Near-duplicates are stored as members
+    of the first signature's cluster.
+    """
+    __tablename__ = "jd_signatures"
+
+    id = db.Column(db.Integer, primary_key=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    last_seen_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    content_hash = db.Column(db.String(64), unique=True, nullable=False, index=True)
+    minhash = db.Column(db.Text, nullable=False)  # JSON list of ints
+    cluster_id = db.Column(db.Integer, nullable=True, index=True)  # representative signature id
+    hit_count = db.Column(db.Integer, default=0, nullable=False)
+
+    # reusable outputs (set on cluster representatives)
+    job_title = db.Column(db.String(255), nullable=True)
+    job_company = db.Column(db.String(255), nullable=True)
+    job_location = db.Column(db.String(255), nullable=True)
+    job_parsed_markdown = db.Column(db.Text, nullable=True)
+
+class JobSignatureBucket(db.Model):
+    __tablename__ = "jd_lsh_buckets"
+    __table_args__ = (db.Index("ix_jd_lsh_buckets_band_bucket", "band", "bucket"),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    signature_id = db.Column(db.Integer, db.ForeignKey("jd_signatures.id"), nullable=False, index=True)
+    band = db.Column(db.Integer, nullable=False)
+    bucket = db.Column(db.String(16), nullable=False)
+
+class UsageCounter(db.Model):
+    __tablename__ = "usage_counters"
+    __table_args__ = (db.UniqueConstraint("user_id", "day", name="uq_usage_counters_user_day"),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False, index=True)
+    day = db.Column(db.Date, nullable=False, index=True)
+
+    runs = db.Column(db.Integer, default=0, nullable=False)
+    tokens = db.Column(db.Integer, default=0, nullable=False)
@@ -0,0 +1,26 @@
+import os
+import threading
+from typing import Callable, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class PerProcess(Generic[T]):
+    """
+    Lazily builds one `factory()` result per process, under a lock.
+    Built again after fork, so gunicorn workers never share the threads,
+    pools or event loops the parent created.
+    """
+
+    def __init__(self, factory: Callable[[], T]):
+        self._factory = factory
+        self._value: Optional[T] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> T:
+        with self._lock:
+            if self._pid != os.getpid():
+                self._value = self._factory()
+                self._pid = os.getpid()
+            return self._value
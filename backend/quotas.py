@@ -0,0 +1,178 @@
+import os
+from datetime import date, datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy.exc import IntegrityError
+
+from backend.db import db
+from backend.models import UsageCounter, User
+
+# Daily limits and scheduling weight per tier
+TIERS = {
+    "free": {
+        "runs": int(os.getenv("QUOTA_FREE_RUNS", "20")),
+        "tokens": int(os.getenv("QUOTA_FREE_TOKENS", "300000")),
+        "weight": 1,
+    },
+    "pro": {
+        "runs": int(os.getenv("QUOTA_PRO_RUNS", "100")),
+        "tokens": int(os.getenv("QUOTA_PRO_TOKENS", "2000000")),
+        "weight": 3,
+    },
+}
+
+
+class QuotaExceeded(Exception):
+    pass
+
+
+def limits_for(user: User) -> Dict[str, Optional[int]]:
+    """
+    Effective daily limits; None means unlimited (admins).
+    """
+    if user.is_admin:
+        return {"runs": None, "tokens": None}
+
+    tier = TIERS.get(user.tier, TIERS["free"])
+    return {
+        "runs": user.daily_run_limit if user.daily_run_limit is not None else tier["runs"],
+        "tokens": user.daily_token_limit if user.daily_token_limit is not None else tier["tokens"],
+    }
+
+
+def weight_for(user_id: int) -> int:
+    tier = db.session.query(User.tier).filter_by(id=user_id).scalar()
+    return TIERS.get(tier, TIERS["free"])["weight"]
+
+
+def quota_day() -> date:
+    # quotas reset at midnight UTC, whatever the server's local timezone
+    return datetime.utcnow().date()
+
+
+def _ensure_counter(user_id: int, day: date) -> None:
+    if UsageCounter.query.filter_by(user_id=user_id, day=day).first():
+        return
+    try:
+        with db.session.begin_nested():
+            db.session.add(UsageCounter(user_id=user_id, day=day, runs=0, tokens=0))
+    except IntegrityError:
+        pass  # created concurrently by another worker
+
+
+def usage_today(user_id: int) -> Dict[str, int]:
+    row = UsageCounter.query.filter_by(user_id=user_id, day=quota_day()).first()
+    return {"runs": row.runs if row else 0, "tokens": row.tokens if row else 0}
+
+
+def claim_run(user: User) -> date:
+    """
+    Counts one /run against today's quota and returns the day it was
+    counted on. The check and the increment are a single conditional
+    UPDATE, so concurrent workers can't overshoot. Raises QuotaExceeded
+    with a user-facing message.
+    """
+    limits = limits_for(user)
+    today = quota_day()
+    _ensure_counter(user.id, today)
+
+    stmt = db.update(UsageCounter).where(
+        UsageCounter.user_id == user.id,
+        UsageCounter.day == today,
+    )
+    if limits["runs"] is not None:
+        stmt = stmt.where(UsageCounter.runs < limits["runs"])
+    if limits["tokens"] is not None:
+        stmt = stmt.where(UsageCounter.tokens < limits["tokens"])
+
+    result = db.session.execute(
+        stmt.values(runs=UsageCounter.runs + 1).execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+
+    if result.rowcount == 0:
+        used = usage_today(user.id)
+        if limits["runs"] is not None and used["runs"] >= limits["runs"]:
+            raise QuotaExceeded(f"Daily run limit reached ({limits['runs']} runs). Try again tomorrow.")
+        raise QuotaExceeded(f"Daily token limit reached ({limits['tokens']:,} tokens). Try again tomorrow.")
+    return today
+
+
+def refund_run(user_id: int, day: date) -> None:
+    """
+    Gives back a run claimed on `day` that never started.
+    """
+    db.session.execute(
+        db.update(UsageCounter)
+        .where(UsageCounter.user_id == user_id, UsageCounter.day == day, UsageCounter.runs > 0)
+        .values(runs=UsageCounter.runs - 1)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+
+
+def record_tokens(user_id: int, tokens: int) -> None:
+    """
+    Adds LLM tokens to today's counter. Caller commits.
+    """
+    if not tokens:
+        return
+    today = quota_day()
+    _ensure_counter(user_id, today)
+    db.session.execute(
+        db.update(UsageCounter)
+        .where(UsageCounter.user_id == user_id, UsageCounter.day == today)
+        .values(tokens=UsageCounter.tokens + tokens)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def usage_report(day: date = None, limit: int = 100):
+    """
+    Users with usage on `day`, heaviest token users first.
+    """
+    day = day or quota_day()
+    return (
+        db.session.query(User, UsageCounter.runs, UsageCounter.tokens)
+        .join(UsageCounter, UsageCounter.user_id == User.id)
+        .filter(UsageCounter.day == day)
+        .order_by(UsageCounter.tokens.desc())
+        .limit(limit)
+        .all()
+    )
+
+
+def update_quota(user: User, form) -> Dict[str, Any]:
+    """
+    Applies tier / limit overrides from an admin form. Only fields present
+    in the form change; a blank limit resets to the tier default.
+    Raises ValueError on bad input; caller commits.
+    """
+    tier = form.get("tier", user.tier).strip()
+    if tier not in TIERS:
+        raise ValueError(f"Unknown tier '{tier}'.")
+
+    def _limit(field: str) -> Optional[int]:
+        raw = form.get(field, "").strip()
+        if not raw:
+            return None
+        if not raw.isdigit():
+            raise ValueError(f"{field.replace('_', ' ').capitalize()} must be a whole number.")
+        return int(raw)
+
+    user.tier = tier
+    if "daily_run_limit" in form:
+        user.daily_run_limit = _limit("daily_run_limit")
+    if "daily_token_limit" in form:
+        user.daily_token_limit = _limit("daily_token_limit")
+    return limits_for(user)
+
+
+def check_tokens(user: User) -> None:
+    """
+    For follow-up work (regenerate/resume): no run is counted, but the
+    user must still have tokens left today.
+    """
+    limit = limits_for(user)["tokens"]
+    if limit is not None and usage_today(user.id)["tokens"] >= limit:
+        raise QuotaExceeded(f"Daily token limit reached ({limit:,} tokens). Try again tomorrow.")
@@ -0,0 +1,215 @@
+import gzip
+import os
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Optional
+
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import select, text
+
+from backend.db import db
+from backend.export import to_jsonl
+from backend.models import Application
+
+# statuses that are safe to remove (never touch a run in progress)
+FINISHED_STATUSES = ("completed", "failed", "cancelled")
+
+# archives are a full copy of each row, internal columns included
+ARCHIVE_COLUMNS = [c.name for c in Application.__table__.columns]
+
+
+def _space_stats() -> Dict[str, int]:
+    """
+    What compaction can change: file size and free pages on SQLite; dead
+    tuples and table size on Postgres, where a plain VACUUM makes space
+    reusable without shrinking any file.
+    """
+    dialect = db.engine.dialect.name
+    if dialect == "sqlite":
+        page_size = db.session.execute(text("PRAGMA page_size")).scalar()
+        return {
+            "size": db.session.execute(text("PRAGMA page_count")).scalar() * page_size,
+            "free_pages": db.session.execute(text("PRAGMA freelist_count")).scalar(),
+        }
+    if dialect == "postgresql":
+        row = db.session.execute(text(
+            "SELECT COALESCE(SUM(n_dead_tup), 0), COALESCE(SUM(pg_total_relation_size(relid)), 0) "
+            "FROM pg_stat_user_tables WHERE relname IN ('applications', 'users')"
+        )).first()
+        return {"dead_tuples": int(row[0]), "size": int(row[1])}
+    return {}
+
+
+def purge_applications(cutoff: datetime, batch_size: int = 500, pause: float = 0.2,
+                       archive_path: str = None, dry_run: bool = False, log=print) -> int:
+    """
+    Deletes finished applications created before `cutoff`, oldest first, in
+    short batches with a pause in between so live traffic isn't blocked.
+
+    Each batch is archived (gzip JSONL, appended) before its DELETE commits,
+    so the job is resumable: rerunning simply continues with what is left.
+    A crash between the two steps can leave a batch archived twice, never lost.
+    """
+    table = Application.__table__
+    where = db.and_(table.c.created_at < cutoff, table.c.status.in_(FINISHED_STATUSES))
+
+    if dry_run:
+        count = db.session.execute(select(db.func.count()).select_from(table).where(where)).scalar()
+        log(f"[dry-run] {count} applications older than {cutoff:%Y-%m-%d} would be removed")
+        return count
+
+    total = 0
+    while True:
+        ids = db.session.execute(
+            select(table.c.id).where(where).order_by(table.c.id).limit(batch_size)
+        ).scalars().all()
+        if not ids:
+            break
+
+        if archive_path:
+            rows = (dict(r._mapping) for r in db.session.execute(select(table).where(table.c.id.in_(ids))))
+            with gzip.open(archive_path, "at", encoding="utf-8") as f:
+                f.writelines(to_jsonl(rows, ARCHIVE_COLUMNS))
+
+        db.session.execute(table.delete().where(table.c.id.in_(ids)))
+        db.session.commit()
+
+        total += len(ids)
+        log(f"removed {total} applications (up to id {ids[-1]})")
+        if len(ids) < batch_size:
+            break
+        time.sleep(pause)
+
+    return total
+
+
+def referenced_uploads() -> set:
+    rows = db.session.execute(
+        select(Application.resume_filename)
+        .where(Application.resume_filename.isnot(None))
+        .distinct()
+        .execution_options(yield_per=1000)
+    )
+    return {name for (name,) in rows}
+
+
+def collect_orphan_uploads(upload_dir: Path, grace_minutes: int = 60, dry_run: bool = False) -> Dict[str, int]:
+    """
+    Removes files in `upload_dir` that no application references. Files newer
+    than the grace period are kept (their run may still be starting).
+    """
+    result = {"files": 0, "bytes": 0}
+    if not upload_dir.exists():
+        return result
+
+    keep = referenced_uploads()
+    cutoff = time.time() - grace_minutes * 60
+
+    for path in upload_dir.iterdir():
+        if not path.is_file() or path.name in keep:
+            continue
+        stat = path.stat()
+        if stat.st_mtime > cutoff:
+            continue
+        if not dry_run:
+            path.unlink()
+        result["files"] += 1
+        result["bytes"] += stat.st_size
+
+    return result
+
+
+def compact_database(full: bool = False, log=print) -> None:
+    """
+    Makes space freed by deletes reusable and refreshes planner statistics
+    without blocking the app. `full` also rewrites the database to return
+    the space to the OS (SQLite VACUUM / Postgres VACUUM FULL); that takes
+    an exclusive lock for the whole rewrite, so keep it for maintenance
+    windows. A full SQLite VACUUM also switches the file to incremental
+    auto-vacuum, so later regular runs can shrink it in place.
+    """
+    dialect = db.engine.dialect.name
+    db.session.remove()
+
+    # VACUUM can't run inside a transaction
+    with db.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        if dialect == "sqlite":
+            conn.execute(text("INSERT INTO applications_fts(applications_fts) VALUES ('optimize')"))
+            if full:
+                conn.execute(text("PRAGMA auto_vacuum = INCREMENTAL"))
+                conn.execute(text("VACUUM"))
+            else:
+                # no-op unless the file uses incremental auto-vacuum. It frees
+                # one page per step, and only executescript steps it to the end
+                conn.connection.driver_connection.executescript("PRAGMA incremental_vacuum;")
+            conn.execute(text("ANALYZE"))
+        elif dialect == "postgresql":
+            options = "FULL, ANALYZE" if full else "ANALYZE"
+            conn.execute(text(f"VACUUM ({options}) applications"))
+            conn.execute(text(f"VACUUM ({options}) users"))
+        else:
+            log(f"compaction not supported on {dialect}; skipped")
+            return
+    log("database compacted" + (" (full vacuum)" if full else ""))
+
+
+def _fmt_bytes(n: Optional[int]) -> str:
+    if n is None:
+        return "n/a"
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(n) < 1024:
+            return f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} TB"
+
+
+# ----------------------------
+# CLI: flask retention run
+# ----------------------------
+@click.group("retention")
+def retention_cli():
+    """Data retention and compaction."""
+
+
+@retention_cli.command("run")
+@click.option("--days", default=int(os.getenv("RETENTION_DAYS", "365")), show_default=True,
+              help="Remove applications older than this many days.")
+@click.option("--batch-size", default=500, show_default=True, help="Rows per DELETE.")
+@click.option("--pause", default=0.2, show_default=True, help="Seconds to sleep between batches.")
+@click.option("--archive", "archive_path", default=None, help="Append removed rows to this .jsonl.gz file.")
+@click.option("--uploads-dir", default="uploads", show_default=True)
+@click.option("--grace-minutes", default=60, show_default=True, help="Keep upload files newer than this.")
+@click.option("--vacuum", is_flag=True,
+              help="Full VACUUM to return space to the OS. Locks the database while it runs.")
+@click.option("--no-compact", is_flag=True, help="Skip compaction and ANALYZE entirely.")
+@click.option("--dry-run", is_flag=True, help="Only report what would be removed.")
+@with_appcontext
+def run_retention(days, batch_size, pause, archive_path, uploads_dir, grace_minutes, vacuum, no_compact,
+                  dry_run):
+    """Archive/delete old applications, remove orphaned uploads, compact the DB."""
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    before = _space_stats()
+
+    removed = purge_applications(cutoff, batch_size=batch_size, pause=pause,
+                                 archive_path=archive_path, dry_run=dry_run, log=click.echo)
+
+    uploads = collect_orphan_uploads(Path(uploads_dir), grace_minutes=grace_minutes, dry_run=dry_run)
+    click.echo(f"{'[dry-run] ' if dry_run else ''}orphaned uploads: {uploads['files']} files, "
+               f"{_fmt_bytes(uploads['bytes'])}")
+
+    if not dry_run and not no_compact:
+        compact_database(full=vacuum, log=click.echo)
+
+    if dry_run:
+        return
+
+    after = _space_stats()
+    click.echo(f"applications removed: {removed}")
+    if "size" in before:
+        click.echo(f"database size: {_fmt_bytes(before['size'])} -> {_fmt_bytes(after['size'])}")
+    if "free_pages" in before:
+        click.echo(f"free pages: {before['free_pages']} -> {after['free_pages']}")
+    if "dead_tuples" in before:
+        click.echo(f"dead tuples: {before['dead_tuples']} -> {after['dead_tuples']}")
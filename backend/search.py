@@ -0,0 +1,129 @@
+import re
+from typing import Any, Dict, List
+
+from sqlalchemy import text
+from sqlalchemy.orm import load_only
+
+from backend.db import db
+from backend.models import Application
+
+# Columns covered by the search index (see the search index migration)
+SEARCH_COLUMNS = [
+    "job_title",
+    "job_company",
+    "job_location",
+    "job_description",
+    "job_parsed_markdown",
+    "tailored_resume_md",
+    "cover_letter",
+    "qna",
+]
+
+# Only what the applications list renders; skips the large Text columns
+LIST_COLUMNS = (
+    Application.id,
+    Application.created_at,
+    Application.job_title,
+    Application.job_company,
+    Application.job_location,
+    Application.job_url,
+    Application.fit_score,
+    Application.status,
+)
+
+PER_PAGE = 20
+
+
+def _terms(q: str) -> List[str]:
+    return re.findall(r"\w+", q.lower())
+
+
+def _fts5_query(terms: List[str]) -> str:
+    # quote every term so user input can't inject FTS5 syntax; prefix-match the words
+    return " ".join(f'"{t}"*' for t in terms)
+
+
+def _sqlite_ids(user_id: int, terms: List[str], limit: int, offset: int):
+    params = {"q": _fts5_query(terms), "uid": user_id, "limit": limit, "offset": offset}
+    where = """
+        FROM applications_fts
+        JOIN applications ON applications.id = applications_fts.rowid
+        WHERE applications_fts MATCH :q AND applications.user_id = :uid
+    """
+    total = db.session.execute(text(f"SELECT count(*) {where}"), params).scalar()
+    ids = db.session.execute(
+        text(f"SELECT applications.id {where} ORDER BY bm25(applications_fts) LIMIT :limit OFFSET :offset"),
+        params,
+    ).scalars().all()
+    return ids, total
+
+
+def _postgres_ids(user_id: int, terms: List[str], limit: int, offset: int):
+    params = {"q": " & ".join(f"{t}:*" for t in terms), "uid": user_id, "limit": limit, "offset": offset}
+    # search_document is a stored generated tsvector with a GIN index (see its migration)
+    where = """
+        FROM applications
+        WHERE search_document @@ to_tsquery('english', :q) AND user_id = :uid
+    """
+    total = db.session.execute(text(f"SELECT count(*) {where}"), params).scalar()
+    ids = db.session.execute(
+        text(
+            f"SELECT id {where} "
+            "ORDER BY ts_rank_cd(search_document, to_tsquery('english', :q)) DESC, created_at DESC "
+            "LIMIT :limit OFFSET :offset"
+        ),
+        params,
+    ).scalars().all()
+    return ids, total
+
+
+def _like_ids(user_id: int, terms: List[str], limit: int, offset: int):
+    # fallback for databases without a search index
+    query = Application.query.filter_by(user_id=user_id)
+    for t in terms:
+        pattern = f"%{t}%"
+        query = query.filter(db.or_(*[getattr(Application, c).ilike(pattern) for c in SEARCH_COLUMNS]))
+
+    total = query.count()
+    ids = [
+        r.id for r in query.with_entities(Application.id)
+        .order_by(Application.created_at.desc())
+        .limit(limit).offset(offset)
+    ]
+    return ids, total
+
+
+def search_applications(user_id: int, q: str, page: int = 1, per_page: int = PER_PAGE) -> Dict[str, Any]:
+    """
+    Ranked full-text search over a user's applications.
+
+    Uses the FTS5 table on SQLite and the stored, GIN-indexed tsvector
+    column on Postgres.
+    Returns the page of rows (list columns only) plus paging info.
+    """
+    terms = _terms(q)
+    page = max(page, 1)
+    result = {"apps": [], "total": 0, "page": page, "pages": 0, "q": q}
+    if not terms:
+        return result
+
+    offset = (page - 1) * per_page
+    dialect = db.engine.dialect.name
+    if dialect == "sqlite":
+        ids, total = _sqlite_ids(user_id, terms, per_page, offset)
+    elif dialect == "postgresql":
+        ids, total = _postgres_ids(user_id, terms, per_page, offset)
+    else:
+        ids, total = _like_ids(user_id, terms, per_page, offset)
+
+    rows = {}
+    if ids:
+        rows = {
+            r.id: r for r in Application.query.options(load_only(*LIST_COLUMNS))
+            .filter(Application.id.in_(ids))
+        }
+
+    result["apps"] = [rows[i] for i in ids if i in rows]  # keep rank order
+    result["total"] = total
+    result["pages"] = (total + per_page - 1) // per_page
+    return result
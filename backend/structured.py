@@ -0,0 +1,114 @@
+from typing import Any, Dict, List, Literal, Type, TypeVar
+
+from pydantic import BaseModel, Field
+
+
+M = TypeVar("M", bound=BaseModel)
+
+
+class FitResult(BaseModel):
+    score: int = Field(ge=0, le=100)
+    level: Literal["Strong Fit", "Moderate Fit", "Weak Fit"]
+    reasons: List[str]
+    gaps: List[str]
+
+
+class JobParseFit(BaseModel):
+    role_summary: List[str]
+    must_have_skills: List[str]
+    nice_to_have_skills: List[str]
+    seniority: Literal["Intern", "Entry", "Junior", "Mid", "Senior"]
+    ats_keywords: List[str]
+    fit: FitResult
+
+
+def parse_and_score_prompt(state: Dict[str, Any]) -> str:
+    user = state["user"]
+    job = state["job"]
+    prompt = f"""
+You are a hiring expert and career coach.
+
+CANDIDATE:
+Name: {user['name']}
+Headline: {user['headline']}
+Location: {user['location']}
+Key skills: {", ".join(user['key_skills'])}
+Constraints: {user['constraints']}
+
+RESUME:
+\"\"\"{user['resume_text']}\"\"\"
+
+JOB:
+Title: {job['title']}
+Company: {job['company']}
+Location: {job['location']}
+
+DESCRIPTION:
+\"\"\"{job['description']}\"\"\"
+
+TASK:
+Analyze the job, then score how well the candidate fits it.
+Return JSON only, exactly this shape:
+
+{{
+  "role_summary": ["3-5 bullet points summarizing the role"],
+  "must_have_skills": ["..."],
+  "nice_to_have_skills": ["..."],
+  "seniority": "Intern" | "Entry" | "Junior" | "Mid" | "Senior",
+  "ats_keywords": ["top 10 ATS keywords"],
+  "fit": {{
+    "score": 0-100,
+    "level": "Strong Fit" | "Moderate Fit" | "Weak Fit",
+    "reasons": ["...", "..."],
+    "gaps": ["...", "..."]
+  }}
+}}
+"""
+    return prompt
+
+
+def repair_prompt(text: str, error: Exception, schema: Type[BaseModel] = JobParseFit) -> str:
+    return f"""
+Your previous answer did not match the required JSON schema.
+
+PREVIOUS ANSWER:
+\"\"\"{text}\"\"\"
+
+VALIDATION ERROR:
+{error}
+
+JSON SCHEMA:
+{schema.model_json_schema()}
+
+Return the corrected JSON only.
+"""
+
+
+def validate(text: str, schema: Type[M] = JobParseFit) -> M:
+    """
+    Parses the model output against `schema`. Raises ValueError
+    (pydantic's ValidationError) when it doesn't match.
+    """
+    start, end = text.find("{"), text.rfind("}")
+    json_str = text[start:end+1] if start != -1 and end != -1 else text
+    return schema.model_validate_json(json_str)
+
+
+def to_markdown(parsed: JobParseFit) -> str:
+    def bullets(items: List[str]) -> str:
+        return "\n".join(f"- {i}" for i in items) or "- None listed"
+
+    return (
+        f"## Role summary\n{bullets(parsed.role_summary)}\n\n"
+        f"## Must-have skills\n{bullets(parsed.must_have_skills)}\n\n"
+        f"## Nice-to-have skills\n{bullets(parsed.nice_to_have_skills)}\n\n"
+        f"## Seniority\n{parsed.seniority}\n\n"
+        f"## ATS keywords\n{bullets(parsed.ats_keywords)}\n"
+    )
+
+
+def apply(state: Dict[str, Any], parsed: JobParseFit) -> Dict[str, Any]:
+    state["job_parsed_markdown"] = to_markdown(parsed)
+    state["job_parsed"] = parsed.model_dump(exclude={"fit"})
+    state["fit"] = parsed.fit.model_dump()
+    return state
@@ -0,0 +1,121 @@
+"""
+Password hashing / login throughput.
+
+    # raw bcrypt verify rate per core at a few costs (no server needed)
+    python -m bench.auth_bench hash --rounds 10,11,12,13
+
+    # end-to-end logins/sec against a running server (users from `bench.loadgen seed`)
+    python -m bench.auth_bench login --base-url http://127.0.0.1:8000 --concurrency 16 --duration 20
+
+Use the numbers to pick BCRYPT_ROUNDS and BCRYPT_THREADS per environment:
+a single login costs roughly 1 / (verifies per second per core) of a core.
+"""
+import argparse
+import os
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import requests
+from passlib.context import CryptContext
+
+from bench.loadgen import USER_EMAIL, USER_PASSWORD
+
+PASSWORD = "correct horse battery staple"
+
+
+def _verify_rate(ctx: CryptContext, hashed: str, threads: int, duration: float) -> float:
+    stop = time.perf_counter() + duration
+    counts = [0] * threads
+
+    def loop(i: int) -> None:
+        while time.perf_counter() < stop:
+            ctx.verify(PASSWORD, hashed)
+            counts[i] += 1
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(loop, range(threads)))
+    return sum(counts) / (time.perf_counter() - t0)
+
+
+def bench_hash(args) -> None:
+    cores = os.cpu_count() or 1
+    threads = args.threads or cores
+    print(f"cores={cores} threads={threads} duration={args.duration}s per measurement")
+    print(f"{'rounds':>6}  {'ms/verify':>9}  {'1 thread/s':>10}  {f'{threads} threads/s':>13}  {'per core/s':>10}")
+    for rounds in [int(r) for r in args.rounds.split(",")]:
+        ctx = CryptContext(schemes=["bcrypt"], bcrypt__default_rounds=rounds)
+        hashed = ctx.hash(PASSWORD)
+        single = _verify_rate(ctx, hashed, 1, args.duration)
+        multi = _verify_rate(ctx, hashed, threads, args.duration)
+        print(f"{rounds:>6}  {1000 / single:>9.1f}  {single:>10.1f}  {multi:>13.1f}  {multi / min(threads, cores):>10.1f}")
+
+
+def bench_login(args) -> None:
+    base_url = args.base_url.rstrip("/")
+    stop = time.perf_counter() + args.duration
+    lock = threading.Lock()
+    latencies: List[float] = []
+    failures = [0]
+
+    def loop(i: int) -> None:
+        email = USER_EMAIL.format(i % args.users)
+        while time.perf_counter() < stop:
+            t0 = time.perf_counter()
+            try:
+                r = requests.post(f"{base_url}/login", data={"email": email, "password": USER_PASSWORD},
+                                  allow_redirects=False, timeout=60)
+                ok = r.status_code == 302 and not r.headers.get("Location", "").endswith("/login")
+            except requests.RequestException:
+                ok = False
+            with lock:
+                latencies.append(time.perf_counter() - t0)
+                if not ok:
+                    failures[0] += 1
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        list(pool.map(loop, range(args.concurrency)))
+    elapsed = time.perf_counter() - t0
+
+    if not latencies:
+        print("no requests completed")
+        return
+    latencies.sort()
+    ok = len(latencies) - failures[0]
+    print(f"logins={len(latencies)} ok={ok} failed/busy={failures[0]} in {elapsed:.1f}s")
+    print(f"throughput={ok / elapsed:.1f}/s  per server core={ok / elapsed / args.server_cores:.1f}/s")
+    print(f"p50={statistics.median(latencies) * 1000:.0f} ms  "
+          f"p95={latencies[int(0.95 * (len(latencies) - 1))] * 1000:.0f} ms  "
+          f"p99={latencies[int(0.99 * (len(latencies) - 1))] * 1000:.0f} ms")
+
+
+def main(argv=None) -> None:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = p.add_subparsers(dest="command", required=True)
+
+    h = sub.add_parser("hash", help="bcrypt verify throughput at different costs")
+    h.add_argument("--rounds", default="10,11,12,13")
+    h.add_argument("--threads", type=int, default=0, help="default: one per core")
+    h.add_argument("--duration", type=float, default=3.0)
+
+    lg = sub.add_parser("login", help="POST /login throughput against a running server")
+    lg.add_argument("--base-url", default="http://127.0.0.1:8000")
+    lg.add_argument("--users", type=int, default=10, help="seeded load-test users to rotate through")
+    lg.add_argument("--concurrency", type=int, default=16)
+    lg.add_argument("--duration", type=float, default=20.0)
+    lg.add_argument("--server-cores", type=int, default=os.cpu_count() or 1,
+                    help="cores available to the server, for the per-core figure")
+
+    args = p.parse_args(argv)
+    if args.command == "hash":
+        bench_hash(args)
+    else:
+        bench_login(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""
+Quality vs latency for pipeline modes.
+
+Runs every case in bench/golden.jsonl through build_job_graph under each
+mode and prints latency, tokens, fit-band agreement and keyword coverage
+side by side, plus how far each mode's scores drift from the first mode.
+
+    python -m bench.eval_pipeline                                  # offline fake LLM
+    python -m bench.eval_pipeline --llm record                     # real Groq, saves answers
+    python -m bench.eval_pipeline --llm replay --replay-latency    # re-run from recording
+    python -m bench.eval_pipeline --modes default,default@llama-3.1-8b-instant --llm live
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from backend.aio import run_async
+from bench.llms import FakeLLM, RecordingLLM
+
+HERE = Path(__file__).resolve().parent
+DEFAULT_DATASET = HERE / "golden.jsonl"
+DEFAULT_RECORDING = HERE / "recordings.json"
+
+# reference fit bands (score ranges, inclusive) used in golden.jsonl
+FIT_BANDS = {
+    "strong": (70, 100),
+    "moderate": (45, 69),
+    "weak": (0, 44),
+}
+
+# mode name -> how to build/run the graph. Append "@<model>" to any mode to
+# run it on a different Groq model (live/record only).
+MODES = {
+    "default": {},
+    "structured": {"structured": True},
+    "async": {"use_async": True},
+    "cached-parse": {"cached": ["parse_job"]},  # parse reused, as with JD dedup
+    "fit-only": {"nodes": ["parse_job", "score_fit"]},  # progressive head
+}
+
+
+def load_cases(path: Path) -> List[Dict[str, Any]]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def initial_state(case: Dict[str, Any]) -> Dict[str, Any]:
+    user = dict(case["user"], resume_text=case["resume_text"])
+    return {"user": user, "job": dict(case["job"]), "questions": list(case.get("questions", []))}
+
+
+def keyword_coverage(case: Dict[str, Any], out: Dict[str, Any]) -> Optional[float]:
+    text = " ".join(out.get(k) or "" for k in ("tailored_resume_md", "cover_letter"))
+    required = case.get("required_keywords", [])
+    if not text.strip() or not required:
+        return None  # mode didn't produce long-form output
+    hits = sum(1 for kw in required if re.search(r"(?<!\w)" + re.escape(kw.lower()) + r"(?!\w)", text.lower()))
+    return hits / len(required)
+
+
+def fit_in_band(case: Dict[str, Any], score: Optional[int]) -> Optional[bool]:
+    band = FIT_BANDS.get(case.get("fit_band"))
+    if band is None or score is None:
+        return None
+    return band[0] <= score <= band[1]
+
+
+def make_llm(args, model: Optional[str]):
+    if args.llm == "fake":
+        return FakeLLM(args.fake_latency_ms, args.fake_ms_per_1k)
+
+    from backend.llm import get_llm
+
+    if args.llm == "live":
+        return get_llm(model=model)
+    inner = get_llm(model=model) if args.llm == "record" else None
+    return RecordingLLM(args.recording, inner=inner, model=model or "", replay_latency=args.replay_latency)
+
+
+def run_case(graph_mod, case: Dict[str, Any], spec: Dict[str, Any]) -> Dict[str, Any]:
+    state = initial_state(case)
+
+    cached = spec.get("cached", [])
+    if cached:
+        # produce the reused outputs up front, outside the timed run
+        state = graph_mod.build_job_graph(cached).invoke(state)
+        state["tokens_used"] = 0
+
+    nodes = [n for n in spec.get("nodes", graph_mod.PIPELINE) if n not in cached]
+    graph = graph_mod.build_job_graph(nodes, structured_mode=spec.get("structured", False))
+
+    t0 = time.perf_counter()
+    if spec.get("use_async"):
+        # same shared loop (and async client pool) as the app, not a new loop per case
+        out = run_async(graph.ainvoke(state))
+    else:
+        out = graph.invoke(state)
+    elapsed = time.perf_counter() - t0
+
+    score = (out.get("fit") or {}).get("score")
+    return {
+        "latency_ms": elapsed * 1000,
+        "tokens": out.get("tokens_used", 0),
+        "score": score if isinstance(score, int) else None,
+        "in_band": fit_in_band(case, score if isinstance(score, int) else None),
+        "coverage": keyword_coverage(case, out),
+    }
+
+
+def _pct(values: List[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+def _mean(values: List[Optional[float]]) -> Optional[float]:
+    values = [v for v in values if v is not None]
+    return statistics.mean(values) if values else None
+
+
+def summarize(mode: str, runs: List[Dict[str, Any]], baseline: Optional[Dict[str, Optional[int]]]) -> Dict[str, Any]:
+    ok = [r for r in runs if "error" not in r]
+    latencies = [r["latency_ms"] for r in ok]
+    drift = None
+    if baseline is not None:
+        diffs = [abs(r["score"] - baseline[r["case"]]) for r in ok
+                 if r["score"] is not None and baseline.get(r["case"]) is not None]
+        drift = _mean(diffs)
+    return {
+        "mode": mode,
+        "runs": len(runs),
+        "errors": len(runs) - len(ok),
+        "p50_ms": _pct(latencies, 0.5) if latencies else None,
+        "p95_ms": _pct(latencies, 0.95) if latencies else None,
+        "tokens": _mean([r["tokens"] for r in ok]),
+        "fit_agree": _mean([float(r["in_band"]) if r["in_band"] is not None else None for r in ok]),
+        "score_drift": drift,
+        "coverage": _mean([r["coverage"] for r in ok]),
+    }
+
+
+def print_table(rows: List[Dict[str, Any]]) -> None:
+    cols = [
+        ("mode", "mode", "{}"),
+        ("runs", "runs", "{}"),
+        ("errors", "err", "{}"),
+        ("p50_ms", "p50 ms", "{:.0f}"),
+        ("p95_ms", "p95 ms", "{:.0f}"),
+        ("tokens", "tokens", "{:.0f}"),
+        ("fit_agree", "fit agree", "{:.0%}"),
+        ("score_drift", "score Δ", "{:.1f}"),
+        ("coverage", "kw cover", "{:.0%}"),
+    ]
+    table = [[h for _, h, _ in cols]]
+    for row in rows:
+        table.append(["-" if row[k] is None else fmt.format(row[k]) for k, _, fmt in cols])
+    widths = [max(len(r[i]) for r in table) for i in range(len(cols))]
+    for r in table:
+        print("  ".join(cell.ljust(w) if i == 0 else cell.rjust(w) for i, (cell, w) in enumerate(zip(r, widths))))
+
+
+def main(argv=None) -> int:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--dataset", type=Path, default=DEFAULT_DATASET)
+    p.add_argument("--modes", default="default,structured,cached-parse,fit-only",
+                   help=f"comma-separated, from: {', '.join(MODES)} (optionally mode@model)")
+    p.add_argument("--llm", choices=["fake", "replay", "record", "live"], default="fake")
+    p.add_argument("--recording", type=Path, default=DEFAULT_RECORDING)
+    p.add_argument("--replay-latency", action="store_true", help="sleep for the recorded latency on replay")
+    p.add_argument("--fake-latency-ms", type=float, default=0.0, help="fixed per-call latency of the fake LLM")
+    p.add_argument("--fake-ms-per-1k", type=float, default=0.0, help="extra fake latency per 1k tokens")
+    p.add_argument("--repeat", type=int, default=1)
+    p.add_argument("--json", dest="json_out", type=Path, help="also write per-run results here")
+    args = p.parse_args(argv)
+
+    if args.llm in ("fake", "replay"):
+        # backend.graph builds a client at import; it's never called in these modes
+        os.environ.setdefault("GROQ_API_KEY", "unused")
+    import backend.graph as graph_mod
+
+    cases = load_cases(args.dataset)
+    summaries, all_runs = [], {}
+    baseline = None
+
+    for mode in [m.strip() for m in args.modes.split(",") if m.strip()]:
+        name, _, model = mode.partition("@")
+        if name not in MODES:
+            p.error(f"unknown mode {name!r}")
+        llm = make_llm(args, model or None)
+        graph_mod.llm = llm
+
+        runs = []
+        for _ in range(args.repeat):
+            for case in cases:
+                try:
+                    r = run_case(graph_mod, case, MODES[name])
+                except Exception as e:
+                    r = {"error": f"{type(e).__name__}: {e}"}
+                    print(f"[{mode}] {case['id']}: {r['error']}", file=sys.stderr)
+                r["case"] = case["id"]
+                runs.append(r)
+
+        if isinstance(llm, RecordingLLM) and args.llm == "record":
+            llm.flush()
+
+        summaries.append(summarize(mode, runs, baseline))
+        all_runs[mode] = runs
+        if baseline is None:
+            baseline = {r["case"]: r.get("score") for r in runs}
+
+    print_table(summaries)
+    if args.json_out:
+        args.json_out.write_text(json.dumps({"summary": summaries, "runs": all_runs}, indent=2))
+    return 1 if any(s["errors"] for s in summaries) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,210 @@
+"""
+Local stand-in for the Groq (OpenAI-style) chat completions API, for load
+tests that must not touch the real service or its rate limits.
+
+    python -m bench.groq_stub --port 9100 --latency lognormal:800,0.5 --error-rate 0.02
+    GROQ_BASE_URL=http://127.0.0.1:9100 GROQ_API_KEY=stub gunicorn -w 4 app:app
+
+Answers come from bench.llms.fake_reply, so every pipeline node gets a
+well-formed response (JSON where the prompt asks for it). GET /stats
+returns request/error counters.
+"""
+import argparse
+import json
+import math
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict
+
+from bench.llms import estimate_tokens, fake_reply
+
+COMPLETION_PATHS = ("/openai/v1/chat/completions", "/v1/chat/completions")
+MODEL_PATHS = ("/openai/v1/models", "/v1/models")
+
+
+def parse_latency(spec: str) -> Callable[[], float]:
+    """
+    "fixed:MS" | "uniform:LO,HI" | "normal:MEAN,SD" | "lognormal:MEDIAN,SIGMA"
+    -> function returning a delay in seconds.
+    """
+    kind, _, params = spec.partition(":")
+    values = [float(v) for v in params.split(",") if v]
+    if kind == "fixed" and len(values) == 1:
+        return lambda: values[0] / 1000
+    if kind == "uniform" and len(values) == 2:
+        return lambda: random.uniform(*values) / 1000
+    if kind == "normal" and len(values) == 2:
+        return lambda: max(0.0, random.gauss(*values)) / 1000
+    if kind == "lognormal" and len(values) == 2:
+        median, sigma = values
+        return lambda: random.lognormvariate(math.log(median), sigma) / 1000
+    raise argparse.ArgumentTypeError(f"bad latency spec: {spec!r}")
+
+
+class Stats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts: Dict[str, int] = {}
+
+    def incr(self, key: str) -> None:
+        with self._lock:
+            self.counts[key] = self.counts.get(key, 0) + 1
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.counts)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "StubServer"
+
+    def log_message(self, fmt, *args):
+        if self.server.verbose:
+            super().log_message(fmt, *args)
+
+    def _json(self, status: int, body: dict, headers: Dict[str, str] = None) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/stats":
+            return self._json(200, self.server.stats.snapshot())
+        if self.path in MODEL_PATHS:
+            return self._json(200, {"object": "list", "data": [{"id": self.server.model, "object": "model"}]})
+        self._json(404, {"error": {"message": "not found"}})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length)
+        if self.path not in COMPLETION_PATHS:
+            return self._json(404, {"error": {"message": "not found"}})
+
+        stats = self.server.stats
+        stats.incr("requests")
+        try:
+            body = json.loads(raw or b"{}")
+            prompt = body["messages"][-1]["content"]
+        except (ValueError, KeyError, IndexError, TypeError):
+            stats.incr("bad_request")
+            return self._json(400, {"error": {"message": "invalid request", "type": "invalid_request_error"}})
+
+        time.sleep(self.server.latency())
+
+        roll = random.random()
+        if roll < self.server.rate_limit_rate:
+            stats.incr("429")
+            return self._json(429, {"error": {"message": "Rate limit reached", "type": "tokens"}},
+                              {"retry-after": "1"})
+        if roll < self.server.rate_limit_rate + self.server.error_rate:
+            stats.incr("500")
+            return self._json(500, {"error": {"message": "Internal server error", "type": "internal_server_error"}})
+
+        content = fake_reply(prompt)
+        usage = {
+            "prompt_tokens": estimate_tokens(prompt),
+            "completion_tokens": estimate_tokens(content),
+        }
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        model = body.get("model") or self.server.model
+
+        if body.get("stream"):
+            stats.incr("stream")
+            return self._stream(content, model, usage)
+
+        stats.incr("ok")
+        self._json(200, {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "logprobs": None,
+                "finish_reason": "stop",
+            }],
+            "usage": usage,
+            "system_fingerprint": "stub",
+        })
+
+    def _stream(self, content: str, model: str, usage: Dict[str, int]) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        cid, created = f"chatcmpl-{uuid.uuid4().hex}", int(time.time())
+
+        def chunk(delta: dict, finish=None, extra=None) -> None:
+            payload = {"id": cid, "object": "chat.completion.chunk", "created": created, "model": model,
+                       "choices": [{"index": 0, "delta": delta, "logprobs": None, "finish_reason": finish}]}
+            if extra:
+                payload.update(extra)
+            self.wfile.write(f"data: {json.dumps(payload)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+        chunk({"role": "assistant", "content": ""})
+        pieces = [content[i:i + self.server.chunk_chars] for i in range(0, len(content), self.server.chunk_chars)]
+        for piece in pieces:
+            time.sleep(self.server.ms_per_chunk / 1000)
+            chunk({"content": piece})
+        chunk({}, finish="stop", extra={"x_groq": {"usage": usage}, "usage": usage})
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, addr, latency, error_rate=0.0, rate_limit_rate=0.0, chunk_chars=16,
+                 ms_per_chunk=10.0, model="stub-model", verbose=False):
+        super().__init__(addr, StubHandler)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.chunk_chars = chunk_chars
+        self.ms_per_chunk = ms_per_chunk
+        self.model = model
+        self.verbose = verbose
+        self.stats = Stats()
+
+
+def main(argv=None) -> None:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=9100)
+    p.add_argument("--latency", type=parse_latency, default=parse_latency("lognormal:800,0.4"),
+                   help="time to first byte: fixed:MS | uniform:LO,HI | normal:MEAN,SD | lognormal:MEDIAN,SIGMA")
+    p.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 500")
+    p.add_argument("--rate-limit-rate", type=float, default=0.0, help="fraction answered with 429")
+    p.add_argument("--chunk-chars", type=int, default=16, help="characters per streamed chunk")
+    p.add_argument("--ms-per-chunk", type=float, default=10.0, help="delay between streamed chunks")
+    p.add_argument("--model", default="stub-model")
+    p.add_argument("-v", "--verbose", action="store_true")
+    args = p.parse_args(argv)
+
+    server = StubServer((args.host, args.port), args.latency, args.error_rate, args.rate_limit_rate,
+                        args.chunk_chars, args.ms_per_chunk, args.model, args.verbose)
+    print(f"Groq stub listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,340 @@
+"""
+Load generator for the web app. Pair it with bench/groq_stub.py so /run
+exercises the full pipeline without calling the real API.
+
+    # once per database: create approved, unmetered load-test users
+    python -m bench.loadgen seed --users 20
+
+    # drive an already running server
+    python -m bench.loadgen run --base-url http://127.0.0.1:8000 --rps 20 --duration 60
+
+    # start stub + gunicorn per worker/thread config and compare
+    python -m bench.loadgen sweep --configs 2x1,4x1,2x8,4x8 --rps 20 --duration 60
+
+Requests are issued open-loop at the target rate (a slow server doesn't slow
+the arrival rate), so queueing shows up in the latency percentiles.
+"""
+import argparse
+import io
+import json
+import os
+import random
+import re
+import signal
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import requests
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+USER_EMAIL = "loadtest{}@example.com"
+USER_PASSWORD = "loadtest-password"
+
+# requests per endpoint in one "round" of the mix
+DEFAULT_MIX = "run=1,applications=4,detail=8"
+
+_APP_LINK = re.compile(r"/applications/(\d+)")
+
+
+# ----------------------------
+# Seeding
+# ----------------------------
+def seed_users(count: int) -> None:
+    os.environ.setdefault("FLASK_SKIP_SEED", "1")
+    sys.path.insert(0, str(REPO_ROOT))
+    from app import app
+    from backend.auth import create_user
+    from backend.db import db
+    from backend.models import User
+
+    with app.app_context():
+        for i in range(count):
+            email = USER_EMAIL.format(i)
+            user = User.query.filter_by(email=email).first() or create_user(email, USER_PASSWORD)
+            user.status = "approved"
+            user.tier = "pro"
+            # load tests shouldn't hit quota limits
+            user.daily_run_limit = 10 ** 9
+            user.daily_token_limit = 10 ** 12
+        db.session.commit()
+    print(f"seeded {count} users ({USER_EMAIL.format(0)} ... / {USER_PASSWORD})")
+
+
+# ----------------------------
+# Load run
+# ----------------------------
+class Client:
+    """
+    One logged-in user: its own cookie jar plus application ids it has seen.
+    """
+
+    def __init__(self, base_url: str, index: int, timeout: float):
+        self.base_url = base_url.rstrip("/")
+        self.session = requests.Session()
+        self.timeout = timeout
+        self.email = USER_EMAIL.format(index)
+        self.app_ids: List[int] = []
+        self._lock = threading.Lock()
+
+    def login(self) -> None:
+        r = self.session.post(f"{self.base_url}/login", data={"email": self.email, "password": USER_PASSWORD},
+                              allow_redirects=False, timeout=self.timeout)
+        if r.status_code != 302 or r.headers.get("Location", "").endswith("/login"):
+            raise RuntimeError(f"login failed for {self.email}; run `python -m bench.loadgen seed` first")
+
+    def _remember(self, html: str) -> None:
+        ids = {int(x) for x in _APP_LINK.findall(html)}
+        if ids:
+            with self._lock:
+                self.app_ids = sorted(ids | set(self.app_ids))[-200:]
+
+    def run(self) -> requests.Response:
+        nonce = f"{time.time():.6f}-{random.random():.6f}"
+        data = {
+            "name": "Load Test",
+            "job_title": "Backend Engineer",
+            "job_company": "Loadtest Inc",
+            # unique JD so single-flight doesn't coalesce the runs
+            "job_description": f"Req {nonce}. Build Python APIs with Flask, PostgreSQL and Docker on AWS. " * 8,
+            "questions": "Why this role?",
+        }
+        files = {"resume_file": ("resume.txt", io.BytesIO(b"Python Flask PostgreSQL Docker AWS engineer. " * 40))}
+        r = self.session.post(f"{self.base_url}/run", data=data, files=files, timeout=self.timeout)
+        self._remember(r.text)
+        return r
+
+    def applications(self) -> requests.Response:
+        r = self.session.get(f"{self.base_url}/applications", timeout=self.timeout)
+        self._remember(r.text)
+        return r
+
+    def detail(self) -> Optional[requests.Response]:
+        with self._lock:
+            app_id = random.choice(self.app_ids) if self.app_ids else None
+        if app_id is None:
+            return None
+        return self.session.get(f"{self.base_url}/applications/{app_id}", timeout=self.timeout)
+
+
+class Recorder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+        self.skipped = 0
+        self.elapsed = 0.0
+
+    def add(self, endpoint: str, seconds: float, ok: bool) -> None:
+        with self._lock:
+            self.latencies.setdefault(endpoint, []).append(seconds)
+            if not ok:
+                self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+
+    def skip(self) -> None:
+        with self._lock:
+            self.skipped += 1
+
+
+def parse_mix(spec: str) -> List[str]:
+    mix = []
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        if name not in ("run", "applications", "detail"):
+            raise argparse.ArgumentTypeError(f"unknown endpoint {name!r}")
+        mix.extend([name] * int(weight or 1))
+    return mix
+
+
+def _call(client: Client, endpoint: str, rec: Recorder) -> None:
+    t0 = time.perf_counter()
+    try:
+        r = getattr(client, endpoint)()
+        if r is None:
+            return  # detail before any application exists
+        ok = r.status_code < 400
+    except requests.RequestException:
+        ok = False
+    rec.add(endpoint, time.perf_counter() - t0, ok)
+
+
+def drive(base_url: str, users: int, rps: float, duration: float, mix: List[str],
+          concurrency: int, timeout: float, warmup_runs: int = 1) -> Recorder:
+    clients = [Client(base_url, i, timeout) for i in range(users)]
+    for c in clients:
+        c.login()
+        for _ in range(warmup_runs):
+            c.run()  # so detail requests have something to fetch
+
+    rec = Recorder()
+    pool = ThreadPoolExecutor(max_workers=concurrency)
+    in_flight = threading.Semaphore(concurrency)
+
+    start = time.perf_counter()
+    n = 0
+    while True:
+        due = start + n / rps
+        now = time.perf_counter()
+        if due - start >= duration:
+            break
+        if due > now:
+            time.sleep(due - now)
+        n += 1
+
+        # arrivals beyond the client's own concurrency are counted, not queued
+        if not in_flight.acquire(blocking=False):
+            rec.skip()
+            continue
+        fut = pool.submit(_call, random.choice(clients), random.choice(mix), rec)
+        fut.add_done_callback(lambda _: in_flight.release())
+
+    pool.shutdown(wait=True)
+    rec.elapsed = time.perf_counter() - start
+    return rec
+
+
+def _pct(values: List[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+def summarize(rec: Recorder, label: str = "") -> List[Dict]:
+    rows = []
+    for endpoint in sorted(rec.latencies):
+        lat = rec.latencies[endpoint]
+        rows.append({
+            "config": label,
+            "endpoint": endpoint,
+            "requests": len(lat),
+            "rps": len(lat) / rec.elapsed,
+            "p50_ms": _pct(lat, 0.50) * 1000,
+            "p95_ms": _pct(lat, 0.95) * 1000,
+            "p99_ms": _pct(lat, 0.99) * 1000,
+            "error_rate": rec.errors.get(endpoint, 0) / len(lat),
+            "dropped": rec.skipped,
+        })
+    return rows
+
+
+def print_table(rows: List[Dict]) -> None:
+    cols = [("config", "{}"), ("endpoint", "{}"), ("requests", "{}"), ("rps", "{:.1f}"), ("p50_ms", "{:.0f}"),
+            ("p95_ms", "{:.0f}"), ("p99_ms", "{:.0f}"), ("error_rate", "{:.1%}"), ("dropped", "{}")]
+    table = [[c for c, _ in cols]] + [[fmt.format(r[c]) for c, fmt in cols] for r in rows]
+    widths = [max(len(t[i]) for t in table) for i in range(len(cols))]
+    for t in table:
+        print("  ".join(cell.ljust(w) if i < 2 else cell.rjust(w) for i, (cell, w) in enumerate(zip(t, widths))))
+
+
+# ----------------------------
+# Sweep over gunicorn configs
+# ----------------------------
+def _wait_ready(url: str, timeout: float = 30.0) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            requests.get(url, timeout=1)
+            return
+        except requests.RequestException:
+            time.sleep(0.2)
+    raise RuntimeError(f"{url} did not come up")
+
+
+def _stop(proc: subprocess.Popen) -> None:
+    proc.send_signal(signal.SIGTERM)
+    try:
+        proc.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+
+
+def sweep(args) -> List[Dict]:
+    env = dict(os.environ)
+    env.update({
+        "GROQ_API_KEY": env.get("GROQ_API_KEY") or "stub",
+        "GROQ_BASE_URL": f"http://127.0.0.1:{args.stub_port}",
+        "FLASK_SKIP_SEED": "1",
+    })
+
+    stub = subprocess.Popen(
+        [sys.executable, "-m", "bench.groq_stub", "--port", str(args.stub_port), "--latency", args.stub_latency,
+         "--error-rate", str(args.stub_error_rate)],
+        cwd=REPO_ROOT, env=env,
+    )
+    rows = []
+    try:
+        _wait_ready(f"http://127.0.0.1:{args.stub_port}/stats")
+        for config in args.configs.split(","):
+            workers, _, threads = config.partition("x")
+            cmd = ["gunicorn", "-w", workers, "-b", f"127.0.0.1:{args.port}", "--timeout", "300"]
+            if threads and int(threads) > 1:
+                cmd += ["-k", "gthread", "--threads", threads]
+            cmd += args.gunicorn_args.split() + ["app:app"]
+
+            server = subprocess.Popen(cmd, cwd=REPO_ROOT, env=env)
+            try:
+                base_url = f"http://127.0.0.1:{args.port}"
+                _wait_ready(f"{base_url}/about")
+                rec = drive(base_url, args.users, args.rps, args.duration, parse_mix(args.mix),
+                            args.concurrency, args.timeout)
+                rows.extend(summarize(rec, config))
+            finally:
+                _stop(server)
+    finally:
+        _stop(stub)
+    return rows
+
+
+def main(argv=None) -> None:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = p.add_subparsers(dest="command", required=True)
+
+    s = sub.add_parser("seed", help="create load-test users in the configured DATABASE_URL")
+    s.add_argument("--users", type=int, default=10)
+
+    def load_args(sp):
+        sp.add_argument("--users", type=int, default=10)
+        sp.add_argument("--rps", type=float, default=10.0, help="target arrival rate (all endpoints)")
+        sp.add_argument("--duration", type=float, default=30.0, help="seconds")
+        sp.add_argument("--mix", default=DEFAULT_MIX, help="endpoint weights, e.g. run=1,applications=4,detail=8")
+        sp.add_argument("--concurrency", type=int, default=200, help="max requests in flight from this client")
+        sp.add_argument("--timeout", type=float, default=300.0)
+        sp.add_argument("--json", dest="json_out", type=Path, help="append result rows (JSON lines)")
+
+    r = sub.add_parser("run", help="drive an already running server")
+    r.add_argument("--base-url", default="http://127.0.0.1:8000")
+    r.add_argument("--label", default="", help="config label for the report, e.g. 4x8")
+    load_args(r)
+
+    w = sub.add_parser("sweep", help="start the stub and gunicorn for each WORKERSxTHREADS config")
+    w.add_argument("--configs", default="2x1,4x1,2x8,4x8")
+    w.add_argument("--port", type=int, default=8765)
+    w.add_argument("--stub-port", type=int, default=9100)
+    w.add_argument("--stub-latency", default="lognormal:800,0.4")
+    w.add_argument("--stub-error-rate", type=float, default=0.0)
+    w.add_argument("--gunicorn-args", default="", help="extra gunicorn flags")
+    load_args(w)
+
+    args = p.parse_args(argv)
+    if args.command == "seed":
+        return seed_users(args.users)
+
+    if args.command == "run":
+        rec = drive(args.base_url, args.users, args.rps, args.duration, parse_mix(args.mix),
+                    args.concurrency, args.timeout)
+        rows = summarize(rec, args.label)
+    else:
+        rows = sweep(args)
+
+    print_table(rows)
+    if args.json_out:
+        with open(args.json_out, "a", encoding="utf-8") as f:
+            for row in rows:
+                f.write(json.dumps(row) + "\n")
+
+
+if __name__ == "__main__":
+    main()
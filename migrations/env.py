@@ -45,6 +45,22 @@ target_db = current_app.extensions['migrate'].db
 # ... etc.
 
 
+# dialect-specific indexes created by hand in migrations (not on the models)
+MANUAL_INDEXES = {"ix_applications_search", "ix_users_email_pattern"}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    # SQLite FTS5 search table and its shadow tables are managed by hand
+    if type_ == "table" and name.startswith("applications_fts"):
+        return False
+    if type_ == "index" and name in MANUAL_INDEXES:
+        return False
+    # Postgres-only generated tsvector column, not on the model
+    if type_ == "column" and name == "search_document":
+        return False
+    return True
+
+
 def get_metadata():
     if hasattr(target_db, 'metadatas'):
         return target_db.metadatas[None]
@@ -65,7 +81,8 @@ def run_migrations_offline():
     """
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
-        url=url, target_metadata=get_metadata(), literal_binds=True
+        url=url, target_metadata=get_metadata(), literal_binds=True,
+        include_object=include_object
     )
 
     with context.begin_transaction():
@@ -100,6 +117,7 @@ def run_migrations_online():
         context.configure(
             connection=connection,
             target_metadata=get_metadata(),
+            include_object=include_object,
             **conf_args
         )
 
@@ -0,0 +1,38 @@
+"""checkpoint pipeline progress on applications
+
+Revision ID: 8d2b41e7c5a0
+Revises: 3a1f6c9d2e47
+Create Date: 2026-10-19 10:03:17.552940
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8d2b41e7c5a0'
+down_revision = '3a1f6c9d2e47'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('applications', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('status', sa.String(length=20), nullable=False, server_default='completed'))
+        batch_op.add_column(sa.Column('pending_nodes', sa.String(length=255), nullable=True))
+        batch_op.add_column(sa.Column('error', sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+
+    # existing rows were saved in one go after a full run
+    op.execute("UPDATE applications SET updated_at = created_at")
+
+    with op.batch_alter_table('applications', schema=None) as batch_op:
+        batch_op.alter_column('updated_at', existing_type=sa.DateTime(), nullable=False)
+
+
+def downgrade():
+    with op.batch_alter_table('applications', schema=None) as batch_op:
+        batch_op.drop_column('updated_at')
+        batch_op.drop_column('error')
+        batch_op.drop_column('pending_nodes')
+        batch_op.drop_column('status')
@@ -0,0 +1,47 @@
+"""stored tsvector column for application search (Postgres)
+
+Revision ID: a4c8e2f19d30
+Revises: f2a6d8c3e951
+Create Date: 2026-10-19 21:04:37.215806
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'a4c8e2f19d30'
+down_revision = 'f2a6d8c3e951'
+branch_labels = None
+depends_on = None
+
+# same document as the b7e3d9a14f62 expression index
+PG_DOCUMENT = (
+    "setweight(to_tsvector('english', coalesce(job_title, '') || ' ' || coalesce(job_company, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(job_location, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(job_description, '')), 'C') || "
+    "setweight(to_tsvector('english', coalesce(job_parsed_markdown, '') || ' ' || coalesce(tailored_resume_md, '') "
+    "|| ' ' || coalesce(cover_letter, '') || ' ' || coalesce(qna, '')), 'D')"
+)
+
+
+def upgrade():
+    # SQLite keeps its FTS5 table; only Postgres changes
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    # computed once per write instead of for every matched row at query time
+    op.execute("DROP INDEX IF EXISTS ix_applications_search")
+    op.execute(
+        f"ALTER TABLE applications ADD COLUMN search_document tsvector "
+        f"GENERATED ALWAYS AS ({PG_DOCUMENT}) STORED"
+    )
+    op.execute("CREATE INDEX ix_applications_search ON applications USING GIN (search_document)")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute("DROP INDEX IF EXISTS ix_applications_search")
+    op.execute("ALTER TABLE applications DROP COLUMN IF EXISTS search_document")
+    op.execute(f"CREATE INDEX ix_applications_search ON applications USING GIN (({PG_DOCUMENT}))")
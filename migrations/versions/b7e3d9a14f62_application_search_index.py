@@ -0,0 +1,85 @@
+"""full-text search index on applications
+
+Revision ID: b7e3d9a14f62
+Revises: 8d2b41e7c5a0
+Create Date: 2026-10-19 11:26:05.803417
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e3d9a14f62'
+down_revision = '8d2b41e7c5a0'
+branch_labels = None
+depends_on = None
+
+COLUMNS = [
+    'job_title',
+    'job_company',
+    'job_location',
+    'job_description',
+    'job_parsed_markdown',
+    'tailored_resume_md',
+    'cover_letter',
+    'qna',
+]
+
+# replaced by a stored search_document column in a4c8e2f19d30
+PG_DOCUMENT = (
+    "setweight(to_tsvector('english', coalesce(job_title, '') || ' ' || coalesce(job_company, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(job_location, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(job_description, '')), 'C') || "
+    "setweight(to_tsvector('english', coalesce(job_parsed_markdown, '') || ' ' || coalesce(tailored_resume_md, '') "
+    "|| ' ' || coalesce(cover_letter, '') || ' ' || coalesce(qna, '')), 'D')"
+)
+
+
+def _sqlite_upgrade():
+    cols = ', '.join(COLUMNS)
+    new_cols = ', '.join(f'new.{c}' for c in COLUMNS)
+    old_cols = ', '.join(f'old.{c}' for c in COLUMNS)
+
+    op.execute(
+        f"CREATE VIRTUAL TABLE applications_fts USING fts5({cols}, "
+        "content='applications', content_rowid='id')"
+    )
+    op.execute(
+        "CREATE TRIGGER applications_fts_ai AFTER INSERT ON applications BEGIN "
+        f"INSERT INTO applications_fts(rowid, {cols}) VALUES (new.id, {new_cols}); END"
+    )
+    op.execute(
+        "CREATE TRIGGER applications_fts_ad AFTER DELETE ON applications BEGIN "
+        f"INSERT INTO applications_fts(applications_fts, rowid, {cols}) VALUES ('delete', old.id, {old_cols}); END"
+    )
+    # only re-index when an indexed column changes (not on status/checkpoint updates)
+    op.execute(
+        f"CREATE TRIGGER applications_fts_au AFTER UPDATE OF {cols} ON applications BEGIN "
+        f"INSERT INTO applications_fts(applications_fts, rowid, {cols}) VALUES ('delete', old.id, {old_cols}); "
+        f"INSERT INTO applications_fts(rowid, {cols}) VALUES (new.id, {new_cols}); END"
+    )
+    op.execute("INSERT INTO applications_fts(applications_fts) VALUES ('rebuild')")
+
+
+def _sqlite_downgrade():
+    op.execute("DROP TRIGGER IF EXISTS applications_fts_au")
+    op.execute("DROP TRIGGER IF EXISTS applications_fts_ad")
+    op.execute("DROP TRIGGER IF EXISTS applications_fts_ai")
+    op.execute("DROP TABLE IF EXISTS applications_fts")
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        _sqlite_upgrade()
+    elif dialect == 'postgresql':
+        # expression index is maintained by Postgres on every insert/update
+        op.execute(f"CREATE INDEX ix_applications_search ON applications USING GIN (({PG_DOCUMENT}))")
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        _sqlite_downgrade()
+    elif dialect == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_applications_search")
@@ -0,0 +1,27 @@
+"""email prefix search index for the admin user table
+
+Revision ID: d9f05b2c6e18
+Revises: c41a8e0f7b93
+Create Date: 2026-10-19 15:02:33.649021
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'd9f05b2c6e18'
+down_revision = 'c41a8e0f7b93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Postgres only uses a btree index for LIKE 'prefix%' with pattern ops;
+    # SQLite searches with a range scan on the existing ix_users_email
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("CREATE INDEX ix_users_email_pattern ON users (email varchar_pattern_ops)")
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_users_email_pattern")
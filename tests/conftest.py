@@ -0,0 +1,103 @@
+import io
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+# app.py reads these at import time
+_tmp = tempfile.mkdtemp(prefix="copilot-tests-")
+os.environ.setdefault("GROQ_API_KEY", "unused")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp}/test.db"
+os.environ["FLASK_SKIP_SEED"] = "1"
+os.environ["SINGLE_FLIGHT_WINDOW_SECONDS"] = "0"
+os.chdir(_tmp)  # uploads/ is created relative to the working directory
+
+import backend.graph as graph_mod
+from app import app as flask_app
+from backend.db import db
+from backend.models import Application, User
+from bench.llms import FakeLLM
+
+RESUME = "Python developer with Flask, SQL and AWS experience."
+JD = "We need a Python engineer who knows Flask, Postgres and AWS."
+
+
+class FlakyLLM(FakeLLM):
+    """
+    bench's offline LLM, raising for prompts that contain `fail_on`.
+    """
+
+    fail_on = None
+
+    def _respond(self, prompt: str):
+        if self.fail_on and self.fail_on in prompt:
+            raise RuntimeError("LLM unavailable")
+        return super()._respond(prompt)
+
+
+@pytest.fixture
+def app():
+    flask_app.config.update(TESTING=True)
+    with flask_app.app_context():
+        db.create_all()
+        yield flask_app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    fake = FlakyLLM()
+    monkeypatch.setattr(graph_mod, "llm", fake)
+    return fake
+
+
+@pytest.fixture
+def user(app):
+    u = User(email="tester@example.com", password_hash="x", status="approved")
+    db.session.add(u)
+    db.session.commit()
+    return u
+
+
+@pytest.fixture
+def client(app, user):
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess["user_id"] = user.id
+        sess["user_email"] = user.email
+        sess["is_admin"] = False
+        sess["user_status"] = user.status
+    return client
+
+
+@pytest.fixture
+def make_application(user):
+    """
+    Saves a running application for `user`; keyword arguments override columns.
+    """
+    def make(**columns):
+        row = Application(**{"user_id": user.id, "job_title": "Engineer", "job_company": "Acme",
+                             "resume_text": RESUME, "job_description": JD, "questions": "Why us?",
+                             "status": "running", **columns})
+        db.session.add(row)
+        db.session.commit()
+        return row
+    return make
+
+
+@pytest.fixture
+def submit_run(client):
+    """
+    POSTs the /run form with RESUME uploaded as a file; keyword arguments override fields.
+    """
+    def submit(**fields):
+        data = {"job_title": "Engineer", "job_company": "Acme", "job_description": JD,
+                "resume_file": (io.BytesIO(RESUME.encode()), "cv.txt"), **fields}
+        return client.post("/run", data=data, content_type="multipart/form-data")
+    return submit
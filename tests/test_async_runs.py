@@ -0,0 +1,78 @@
+import asyncio
+
+from backend.aio import iter_async
+from backend.applications import pending_nodes, state_from_application
+from backend.background import arun_application
+from backend.db import db
+from backend.graph import PIPELINE
+from backend.models import Application
+
+
+def test_iter_async_closes_generator_on_early_exit():
+    closed = []
+
+    async def numbers():
+        try:
+            for i in range(10):
+                yield i
+        finally:
+            closed.append(True)
+
+    for i in iter_async(numbers()):
+        if i == 2:
+            break
+
+    assert closed == [True]
+
+
+def run_async_task(app, row, nodes=PIPELINE):
+    asyncio.run(arun_application(app, row.id, state_from_application(row), list(nodes)))
+    db.session.expire_all()
+    return db.session.get(Application, row.id)
+
+
+def test_async_run_checkpoints_every_node(app, make_application, llm):
+    row = make_application()
+
+    row = run_async_task(app, row)
+
+    assert row.status == "completed"
+    assert row.fit_score is not None
+    assert row.tailored_resume_md and row.cover_letter and row.qna
+    assert row.inflight_key is None
+
+
+def test_async_run_failure_is_resumable(app, make_application, llm):
+    row = make_application()
+    llm.fail_on = "cover letter writer"
+
+    row = run_async_task(app, row)
+
+    assert row.status == "failed"
+    assert pending_nodes(row) == ["cover_letter", "qna"]
+    assert row.tailored_resume_md
+
+
+def test_run_returns_before_async_pipeline(submit_run, llm, monkeypatch):
+    import app as app_module
+
+    submitted = []
+    real_submit = app_module.submit_async
+
+    def submit(*args, **kwargs):
+        submitted.append(real_submit(*args, **kwargs))
+        return submitted[-1]
+
+    monkeypatch.setattr(app_module, "ASYNC_GRAPH", True)
+    monkeypatch.setattr(app_module, "submit_async", submit)
+
+    resp = submit_run()
+
+    assert resp.status_code == 302
+    app_id = int(resp.headers["Location"].rstrip("/").split("/")[-1])
+
+    submitted[0].result(timeout=10)
+    db.session.expire_all()
+    row = db.session.get(Application, app_id)
+    assert row.status == "completed"
+    assert row.cover_letter
@@ -0,0 +1,175 @@
+import pytest
+
+from backend.applications import (
+    pending_nodes,
+    run_with_checkpoints,
+    state_from_application,
+)
+from backend.db import db
+from backend.graph import PIPELINE, get_partial_graph, nodes_to_rerun
+from backend.models import Application
+
+
+def run(row, nodes=None):
+    nodes = list(nodes or PIPELINE)
+    state = state_from_application(row)
+    return run_with_checkpoints(get_partial_graph(tuple(nodes)), state, row, nodes, use_async=False)
+
+
+def failed_at_cover_letter(make_application, llm) -> Application:
+    row = make_application()
+    llm.fail_on = "cover letter writer"
+    with pytest.raises(RuntimeError):
+        run(row)
+    assert row.status == "failed"
+    assert pending_nodes(row) == ["cover_letter", "qna"]
+    return row
+
+
+def test_failed_run_resumes_pending_nodes(make_application, llm):
+    row = failed_at_cover_letter(make_application, llm)
+    assert row.tailored_resume_md and not row.cover_letter
+
+    llm.fail_on = None
+    run(row, pending_nodes(row))
+
+    assert row.status == "completed"
+    assert row.pending_nodes is None
+    assert row.cover_letter and row.qna
+
+
+def test_regenerate_keeps_earlier_pending_nodes(make_application, llm):
+    row = failed_at_cover_letter(make_application, llm)
+
+    run(row, nodes_to_rerun("resume_tailor"))
+
+    # resume_tailor re-ran, but cover_letter/qna were never produced
+    assert row.status == "failed"
+    assert pending_nodes(row) == ["cover_letter", "qna"]
+    assert row.inflight_key is None
+
+    llm.fail_on = None
+    run(row, pending_nodes(row))
+    assert row.status == "completed"
+    assert row.cover_letter and row.qna
+
+
+def test_failed_regenerate_stays_resumable(make_application, llm):
+    row = failed_at_cover_letter(make_application, llm)
+
+    llm.fail_on = "resume optimization assistant"
+    with pytest.raises(RuntimeError):
+        run(row, nodes_to_rerun("resume_tailor"))
+
+    assert row.status == "failed"
+    assert pending_nodes(row) == ["resume_tailor", "cover_letter", "qna"]
+
+
+def test_regenerate_on_cancelled_row_stays_cancelled(make_application, llm):
+    row = make_application()
+    run(row, ["parse_job", "score_fit"])
+    row.status = "cancelled"
+    row.pending_nodes = "resume_tailor,cover_letter,qna"
+    db.session.commit()
+
+    run(row, nodes_to_rerun("score_fit"))  # also re-runs cover_letter
+
+    assert row.status == "cancelled"
+    assert pending_nodes(row) == ["resume_tailor", "qna"]
+
+
+def test_regenerate_on_completed_row_completes(make_application, llm):
+    row = make_application()
+    run(row)
+    assert row.status == "completed"
+
+    run(row, nodes_to_rerun("qna"))
+
+    assert row.status == "completed"
+    assert row.pending_nodes is None
+
+
+def test_head_run_leaves_row_in_flight(make_application, llm):
+    row = make_application()
+    row.pending_nodes = ",".join(PIPELINE)
+    row.inflight_key = "key"
+    db.session.commit()
+
+    state = state_from_application(row)
+    head = ["parse_job", "score_fit"]
+    run_with_checkpoints(get_partial_graph(tuple(head)), state, row, head, use_async=False, finalize=False)
+
+    assert row.status == "running"
+    assert row.inflight_key == "key"
+    assert pending_nodes(row) == ["resume_tailor", "cover_letter", "qna"]
+
+    run(row, pending_nodes(row))
+    assert row.status == "completed"
+    assert row.inflight_key is None
+
+
+def test_progressive_run_hands_tail_over_in_flight(submit_run, llm, monkeypatch):
+    import app as app_module
+
+    handed_over = []
+    monkeypatch.setattr(app_module, "PROGRESSIVE_RESULTS", True)
+    monkeypatch.setattr(app_module, "submit_remaining",
+                        lambda app, app_id, user_id, nodes: handed_over.append((app_id, nodes)))
+
+    resp = submit_run()
+    assert resp.status_code == 200
+
+    app_id, tail = handed_over[0]
+    row = db.session.get(Application, app_id)
+    assert tail == ["resume_tailor", "cover_letter", "qna"]
+    assert row.status == "running"
+    assert row.inflight_key
+    assert pending_nodes(row) == tail
+    assert row.fit_score is not None
+
+
+def test_queued_tail_skips_row_that_went_stale(app, make_application, llm):
+    from datetime import datetime, timedelta
+
+    from backend.applications import STALE_RUN_MINUTES, mark_stale
+    from backend.background import finish_application
+
+    row = make_application()
+    head = ["parse_job", "score_fit"]
+    row.pending_nodes = ",".join(PIPELINE)
+    row.inflight_key = "key"
+    db.session.commit()
+    run_with_checkpoints(get_partial_graph(tuple(head)), state_from_application(row), row, head,
+                         use_async=False, finalize=False)
+    tail = pending_nodes(row)
+
+    # the tail waited in the queue past the stale cutoff; a page view failed the row
+    row.updated_at = datetime.utcnow() - timedelta(minutes=STALE_RUN_MINUTES + 1)
+    db.session.commit()
+    assert mark_stale(row)
+    assert row.status == "failed" and row.inflight_key is None
+
+    calls = []
+    llm_respond = llm._respond
+    llm._respond = lambda prompt: calls.append(prompt) or llm_respond(prompt)
+    finish_application(app, row.id, tail)
+
+    assert calls == []
+    db.session.expire_all()
+    assert db.session.get(Application, row.id).status == "failed"
+
+
+def test_queued_tail_runs_while_row_waits(app, make_application, llm):
+    from backend.background import finish_application
+
+    row = make_application()
+    row.pending_nodes = "resume_tailor,cover_letter,qna"
+    row.inflight_key = "key"
+    db.session.commit()
+
+    finish_application(app, row.id, ["resume_tailor", "cover_letter", "qna"])
+
+    db.session.expire_all()
+    row = db.session.get(Application, row.id)
+    assert row.status == "completed"
+    assert row.cover_letter
@@ -0,0 +1,48 @@
+from backend.db import db
+from backend.dedup import (
+    _add_signature,
+    find_duplicate,
+    fingerprint,
+    record_hit,
+    register,
+)
+from backend.models import JobSignature, JobSignatureBucket
+
+JD = "Senior Python engineer to build Flask services on Postgres and AWS, with CI and code review."
+JOB = {"title": "Engineer", "company": "Acme", "location": "Remote"}
+
+
+def test_register_and_reuse(app):
+    fp = fingerprint(JD)
+    sig = register(fp, JOB, "## Must-have\n- Python")
+    assert sig.cluster_id == sig.id
+
+    rep = find_duplicate(fingerprint(JD + " "))
+    assert rep.id == sig.id
+    record_hit(rep, fp)
+    assert rep.hit_count == 1
+
+
+def test_concurrent_insert_is_ignored(app):
+    fp = fingerprint(JD)
+    first = register(fp, JOB, "## Must-have\n- Python")
+
+    # another request stored the same JD between our lookup and insert
+    assert _add_signature(fp, job_parsed_markdown="other") is None
+    db.session.commit()
+
+    assert JobSignature.query.count() == 1
+    assert JobSignatureBucket.query.filter_by(signature_id=first.id).count() > 0
+
+
+def test_structured_parse_is_not_shared(submit_run, llm, monkeypatch):
+    import app as app_module
+
+    # parse_and_score output depends on the submitting candidate's resume
+    monkeypatch.setattr(app_module, "STRUCTURED_PARSE_FIT", True)
+    assert submit_run().status_code == 200
+    assert JobSignature.query.count() == 0
+
+    monkeypatch.setattr(app_module, "STRUCTURED_PARSE_FIT", False)
+    assert submit_run(job_description=JD).status_code == 200
+    assert JobSignature.query.count() == 1
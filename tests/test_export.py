@@ -0,0 +1,25 @@
+import csv
+import io
+
+from backend.export import EXPORT_COLUMNS, to_csv, to_jsonl
+
+
+def test_internal_columns_not_exported():
+    for name in ("request_key", "inflight_key", "error"):
+        assert name not in EXPORT_COLUMNS
+    assert "job_title" in EXPORT_COLUMNS
+
+
+def test_csv_neutralizes_formulas():
+    rows = [{"job_title": "=HYPERLINK(\"http://x\")", "job_company": "-2+3", "fit_score": -5},
+            {"job_title": "Engineer", "job_company": "@SUM(A1)", "fit_score": 70}]
+    out = "".join(to_csv(iter(rows), ["job_title", "job_company", "fit_score"]))
+
+    parsed = list(csv.reader(io.StringIO(out)))
+    assert parsed[1] == ["'=HYPERLINK(\"http://x\")", "'-2+3", "-5"]
+    assert parsed[2] == ["Engineer", "'@SUM(A1)", "70"]
+
+
+def test_jsonl_keeps_raw_values():
+    rows = [{"job_title": "=1+1"}]
+    assert "".join(to_jsonl(iter(rows), ["job_title"])) == '{"job_title": "=1+1"}\n'
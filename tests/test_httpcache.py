@@ -0,0 +1,49 @@
+from backend import httpcache
+from backend.db import db
+from backend.models import Application
+
+
+def completed_application(user):
+    row = Application(user_id=user.id, job_title="Engineer", job_company="Acme", resume_text="cv",
+                      job_description="jd", status="completed", cover_letter="Dear team")
+    db.session.add(row)
+    db.session.commit()
+    return row
+
+
+def test_detail_page_revalidates_by_etag_only(client, user):
+    row = completed_application(user)
+
+    first = client.get(f"/applications/{row.id}")
+    assert first.status_code == 200
+    assert first.headers.get("ETag")
+    assert "Last-Modified" not in first.headers
+
+    again = client.get(f"/applications/{row.id}", headers={"If-None-Match": first.headers["ETag"]})
+    assert again.status_code == 304
+
+    dated = client.get(f"/applications/{row.id}", headers={"If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"})
+    assert dated.status_code == 200
+
+
+def test_etag_changes_with_build(client, user, monkeypatch):
+    row = completed_application(user)
+    before = client.get(f"/applications/{row.id}").headers["ETag"]
+
+    monkeypatch.setattr(httpcache, "_code_version", "next-deploy")
+    after = client.get(f"/applications/{row.id}", headers={"If-None-Match": before})
+
+    assert after.status_code == 200
+    assert after.headers["ETag"] != before
+
+
+def test_etag_follows_account_changes(client, user):
+    row = completed_application(user)
+    before = client.get(f"/applications/{row.id}").headers["ETag"]
+
+    user.is_admin = True
+    db.session.commit()
+    after = client.get(f"/applications/{row.id}", headers={"If-None-Match": before})
+
+    assert after.status_code == 200
+    assert after.headers["ETag"] != before
@@ -0,0 +1,43 @@
+from datetime import datetime
+
+from backend.applications import find_inflight, request_key
+from backend.models import UsageCounter
+from backend.quotas import claim_run, quota_day, refund_run, usage_today
+from tests.conftest import JD, RESUME
+
+
+def test_quota_day_is_utc():
+    assert quota_day() == datetime.utcnow().date()
+
+
+def test_refund_gives_back_a_claimed_run(user):
+    day = claim_run(user)
+    assert usage_today(user.id)["runs"] == 1
+
+    refund_run(user.id, day)
+    assert usage_today(user.id)["runs"] == 0
+
+    refund_run(user.id, day)  # never goes negative
+    assert usage_today(user.id)["runs"] == 0
+
+
+def test_coalesced_submission_is_not_charged(submit_run, make_application, user, llm, monkeypatch):
+    import app as app_module
+
+    # the same submission is already in flight, but our first lookup raced past it
+    key = request_key(user.id, RESUME, JD, [])
+    running = make_application(questions=None, request_key=key, inflight_key=key)
+
+    lookups = []
+
+    def find_inflight_racing(run_key):
+        lookups.append(run_key)
+        return None if len(lookups) == 1 else find_inflight(run_key)
+
+    monkeypatch.setattr(app_module, "find_inflight", find_inflight_racing)
+
+    resp = submit_run()
+
+    assert resp.status_code == 302
+    assert resp.headers["Location"].endswith(f"/applications/{running.id}")
+    assert UsageCounter.query.filter_by(user_id=user.id).one().runs == 0
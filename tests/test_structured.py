@@ -0,0 +1,57 @@
+import json
+
+import pytest
+
+import backend.graph as graph_mod
+from backend.graph import build_job_graph
+
+STATE = {
+    "user": {"name": "Candidate", "headline": "", "location": "", "key_skills": [], "constraints": "",
+             "resume_text": "Python developer with Flask and AWS experience."},
+    "job": {"title": "Engineer", "company": "Acme", "location": "Remote",
+            "description": "Python engineer for Flask services on AWS."},
+    "job_parsed_markdown": "## Must-have\n- Python",
+    "questions": [],
+}
+GOOD_FIT = {"score": 82, "level": "Strong Fit", "reasons": ["Python"], "gaps": []}
+
+
+class ScriptedLLM:
+    """
+    Answers with the given replies in order and records the prompts.
+    """
+
+    def __init__(self, *replies):
+        self.replies = list(replies)
+        self.prompts = []
+
+    def bind(self, **kwargs):
+        return self
+
+    def invoke(self, prompt, **kwargs):
+        self.prompts.append(prompt)
+        return type("Message", (), {"content": self.replies.pop(0), "usage_metadata": {}})()
+
+
+def score_only(monkeypatch, *replies):
+    llm = ScriptedLLM(*replies)
+    monkeypatch.setattr(graph_mod, "llm", llm)
+    out = build_job_graph(["score_fit"], structured_mode=True).invoke(dict(STATE))
+    return out, llm
+
+
+def test_standalone_score_fit_is_validated(monkeypatch):
+    out, llm = score_only(monkeypatch, json.dumps(GOOD_FIT))
+    assert out["fit"] == GOOD_FIT
+    assert len(llm.prompts) == 1
+
+
+def test_standalone_score_fit_repairs_once(monkeypatch):
+    out, llm = score_only(monkeypatch, "Score: pretty good", json.dumps(GOOD_FIT))
+    assert out["fit"]["score"] == 82
+    assert "did not match the required JSON schema" in llm.prompts[1]
+
+
+def test_standalone_score_fit_fails_instead_of_faking_a_score(monkeypatch):
+    with pytest.raises(ValueError):
+        score_only(monkeypatch, "not json", json.dumps({"score": 140, "level": "Great"}))